@@ -0,0 +1,355 @@
+"""
+Benchmarks for the hot paths of ReaQt.
+
+They run without a display, on Qt's offscreen platform, and write
+their results to a JSON file, so that runs can be compared::
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+
+Use ``--sizes`` to choose the list sizes (``100,1000,10000`` by default)
+and ``--only`` to run only the benchmarks whose name contains a string.
+The benchmarks that rebuild every item widget only run up to
+``--rebuild-limit`` items, as rebuilding is quadratic in Qt.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from qtpy.QtWidgets import QApplication, QLabel, QScrollArea # pylint: disable=E0611
+
+from reaqt import widgets
+from reaqt.common import connect
+from reaqt.models import RxTableModel
+from reaqt.state import RxList, RxMap, RxTable
+
+BENCHMARKS = []
+
+def benchmark(func):
+    """Register a benchmark.
+
+    A benchmark is a generator function taking the list sizes and the
+    largest size for which every item widget may be rebuilt. It yields
+    ``(name, setup, run, operations)`` tuples: ``setup()`` builds
+    the objects and returns them, and ``run(objects)`` is measured.
+    """
+    BENCHMARKS.append(func)
+    return func
+
+
+def measure(app, setup, run, operations, repeat):
+    """Returns the timings of ``run`` as a dict.
+
+    The peak memory is measured in an extra run, as tracing
+    the allocations slows the code down.
+    """
+    timings = []
+    peak = 0
+    for attempt in range(repeat + 1):
+        objects = setup()
+        app.processEvents()
+        gc.collect()
+        traced = attempt == repeat
+        if traced:
+            tracemalloc.start()
+        start = time.perf_counter()
+        run(objects)
+        app.processEvents()
+        elapsed = time.perf_counter() - start
+        if traced:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            timings.append(elapsed)
+        del objects
+        gc.collect()
+
+    timings.sort()
+    best = timings[0]
+    return {'operations': operations,
+            'repeat': repeat,
+            'best': best,
+            'median': timings[len(timings) // 2],
+            'latency': best / operations,
+            'throughput': operations / best if best > 0 else None,
+            'peak_memory': peak}
+
+
+class Item(QLabel):
+    """A typical item widget for a reactive box"""
+
+    def __init__(self, index, value):
+        super().__init__("Item #{} is '{}'".format(index, value))
+
+
+class IndexedItem(widgets.RxLabel):
+    """An item widget whose index is updated in place when it moves"""
+
+    def __init__(self, index, value):
+        super().__init__(insert=lambda i: "Item #{} is '{}'".format(i, value))
+        self.rx.index = self.rx.text
+        self.rx.index.on_next(index)
+
+
+class PooledItem(Item):
+    """An item widget that can be reused for another item"""
+
+    def rebind(self, index, value):
+        self.setText("Item #{} is '{}'".format(index, value))
+
+
+def shown_box(frame_budget=None):
+    """An empty box, shown in a scroll area"""
+    box = widgets.RxVBox(RxList([]), Item, frame_budget=frame_budget)
+    scroll = QScrollArea()
+    scroll.setWidget(box)
+    scroll.setWidgetResizable(True)
+    scroll.show()
+    return scroll
+
+
+def extend_and_render(scroll, size):
+    box = scroll.widget()
+    box.rx.state.extend(list(range(size)))
+    while box.rx.controller.pending:
+        QApplication.processEvents()
+
+
+@benchmark
+def rx_box(sizes, rebuild_limit):
+    for size in sizes:
+        def setup(size=size, item_class=Item, **kwargs):
+            return widgets.RxVBox(RxList(list(range(size))), item_class, **kwargs)
+
+        def setup_empty():
+            return widgets.RxVBox(RxList([]), Item)
+
+        yield ('rx_box.construct[{}]'.format(size), lambda: None,
+               lambda _, size=size: widgets.RxVBox(RxList(list(range(size))), Item), size)
+        yield ('rx_box.append[{}]'.format(size), setup_empty,
+               lambda box, size=size: [box.rx.state.append(i) for i in range(size)], size)
+        yield ('rx_box.extend[{}]'.format(size), setup_empty,
+               lambda box, size=size: box.rx.state.extend(list(range(size))), size)
+        yield ('rx_box.extend_shown[{}]'.format(size), shown_box,
+               lambda scroll, size=size: extend_and_render(scroll, size), size)
+        yield ('rx_box.extend_sliced[{}]'.format(size), lambda: shown_box(frame_budget=10),
+               lambda scroll, size=size: extend_and_render(scroll, size), size)
+        yield ('rx_box.insert_front_indexed[{}]'.format(size),
+               lambda setup=setup: setup(item_class=IndexedItem),
+               lambda box: [box.rx.state.insert(0, -i) for i in range(10)], 10)
+        yield ('rx_box.sort_pooled[{}]'.format(size),
+               lambda setup=setup, size=size: setup(item_class=PooledItem, pool_size=size),
+               lambda box: box.rx.state.sort(reverse=True), 1)
+        yield ('rx_box.sort_keyed_indexed[{}]'.format(size),
+               lambda setup=setup: setup(item_class=IndexedItem, key=lambda item: item),
+               lambda box: box.rx.state.sort(reverse=True), 1)
+        if size > rebuild_limit:
+            continue
+        # Item widgets without an index port are rebuilt when they move
+        yield ('rx_box.insert_front[{}]'.format(size), setup,
+               lambda box: [box.rx.state.insert(0, -i) for i in range(10)], 10)
+        yield ('rx_box.sort[{}]'.format(size), setup,
+               lambda box: box.rx.state.sort(reverse=True), 1)
+        yield ('rx_box.sort_keyed[{}]'.format(size),
+               lambda setup=setup: setup(key=lambda item: item),
+               lambda box: box.rx.state.sort(reverse=True), 1)
+
+
+@benchmark
+def rx_map_chain(sizes, rebuild_limit):
+    for length in (1, 10, 100):
+        def setup(length=length):
+            state = RxMap({'k{}'.format(i): 0 for i in range(length)})
+            spin_boxes = []
+            for i in range(length):
+                spin_box = widgets.RxSpinBox()
+                spin_box.setMaximum(10 ** 9)
+                connect(state['k{}'.format(i)], spin_box.rx.value)
+                spin_boxes.append(spin_box)
+                if i > 0:
+                    state['k{}'.format(i - 1)].map(lambda x: x + 1).subscribe(state['k{}'.format(i)])
+            return state, spin_boxes
+
+        def run(objects):
+            state, _ = objects
+            for value in range(1000):
+                state['k0'] = value
+
+        yield ('rx_map.connect_chain[{}]'.format(length), setup, run, 1000)
+
+
+@benchmark
+def branches(sizes, rebuild_limit):
+    def match(keep_alive):
+        state = RxMap({'text': ''})
+        widget = widgets.RxMatch(state['text'],
+                                 branches=[(lambda x, c=c: x == c, lambda c=c: QLabel(c)) for c in 'ABCD'],
+                                 otherwise=lambda: QLabel("?"),
+                                 keep_alive=keep_alive)
+        return state, widget
+
+    def run_match(objects):
+        state, _ = objects
+        for i in range(1000):
+            state['text'] = 'ABCDE'[i % 5]
+
+    def run_same_branch(objects):
+        state, _ = objects
+        for i in range(1000):
+            state['text'] = 'A'
+
+    def condition():
+        state = RxMap({'condition': True})
+        widget = widgets.RxIf(state['condition'],
+                              then=lambda: QLabel("True"),
+                              else_=lambda: QLabel("False"))
+        return state, widget
+
+    def run_if(objects):
+        state, _ = objects
+        for i in range(1000):
+            state['condition'] = bool(i % 2)
+
+    yield ('rx_match.switch', lambda: match(0), run_match, 1000)
+    yield ('rx_match.switch_keep_alive', lambda: match(5), run_match, 1000)
+    yield ('rx_match.same_branch', lambda: match(0), run_same_branch, 1000)
+    yield ('rx_if.switch', condition, run_if, 1000)
+
+
+@benchmark
+def combo_box(sizes, rebuild_limit):
+    for size in sizes:
+        def setup():
+            combo = widgets.RxSimpleComboBox()
+            return combo
+
+        def run(combo, size=size):
+            items = [str(i) for i in range(size)]
+            for _ in range(3):
+                combo.rx.items.on_next(items)
+
+        yield ('rx_simple_combo_box.reset_items[{}]'.format(size), setup, run, 3)
+
+        def setup_model(size=size):
+            return widgets.RxComboBox(RxList([str(i) for i in range(size)]), filterable=True)
+
+        def run_items(combo, size=size):
+            items = [str(i) for i in range(size)]
+            for i in range(3):
+                items[size // 2] = 'changed {}'.format(i)
+                combo.rx.items.on_next(items)
+
+        def run_values(combo, size=size):
+            for i in range(1000):
+                combo.rx.value.on_next(str(i * 7919 % size))
+
+        yield ('rx_combo_box.set_items[{}]'.format(size), setup_model, run_items, 3)
+        yield ('rx_combo_box.set_value[{}]'.format(size), setup_model, run_values, 1000)
+
+
+@benchmark
+def table_model(sizes, rebuild_limit):
+    for size in sizes:
+        def setup(size=size):
+            table = RxTable([('c{}'.format(i), float) for i in range(20)],
+                            [[0.0] * 20 for _ in range(size)])
+            return table, RxTableModel(table, coalesce=False)
+
+        def run_cells(objects):
+            table, _ = objects
+            for i in range(1000):
+                table[i % 50, i % 20] = float(i)
+
+        def run_batch(objects):
+            table, _ = objects
+            for i in range(10):
+                with table.batch():
+                    for j in range(100):
+                        table[j % 50, j % 20] = float(i)
+
+        def run_column(objects, size=size):
+            table, _ = objects
+            table.set_column(3, [1.0] * size)
+
+        yield ('rx_table_model.set_cell[{}]'.format(size), setup, run_cells, 1000)
+        yield ('rx_table_model.batch[{}]'.format(size), setup, run_batch, 10)
+        yield ('rx_table_model.set_column[{}]'.format(size), setup, run_column, 1)
+
+
+@benchmark
+def construction(sizes, rebuild_limit):
+    classes = [widgets.RxPushButton, widgets.RxSlider, widgets.RxCheckBox, widgets.RxRadioButton,
+               widgets.RxLabel, widgets.RxLineEdit, widgets.RxSpinBox, widgets.RxCalendarWidget,
+               widgets.RxDateEdit, widgets.RxTimeEdit, widgets.RxDateTimeEdit, widgets.RxTabsWidget,
+               widgets.RxSimpleComboBox]
+    for cls in classes:
+        count = 20 if cls is widgets.RxCalendarWidget else 500
+        yield ('construct.{}'.format(cls.__name__), lambda: [],
+               lambda kept, cls=cls, count=count: kept.extend(cls() for _ in range(count)), count)
+
+
+def compare(previous, current, tolerance):
+    """Print the benchmarks whose latency changed by more than ``tolerance``."""
+    regressions = 0
+    for name, result in sorted(current['results'].items()):
+        before = previous['results'].get(name)
+        if before is None:
+            continue
+        ratio = result['latency'] / before['latency'] if before['latency'] else float('inf')
+        if ratio > 1 + tolerance:
+            regressions += 1
+            print('SLOWER  {:<45} {:6.2f}x'.format(name, ratio))
+        elif ratio < 1 - tolerance:
+            print('FASTER  {:<45} {:6.2f}x'.format(name, 1 / ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='100,1000,10000',
+                        help='comma separated list sizes for the list benchmarks')
+    parser.add_argument('--rebuild-limit', type=int, default=1000,
+                        help='largest size for the benchmarks that rebuild every item widget')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--only', default='', help='only run benchmarks containing this string')
+    parser.add_argument('--output', default='benchmarks.json')
+    parser.add_argument('--compare', help='a previous output file to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='relative change in latency reported by --compare')
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = dict()
+    for group in BENCHMARKS:
+        for name, setup, run, operations in group(sizes, args.rebuild_limit):
+            if args.only not in name:
+                continue
+            result = results[name] = measure(app, setup, run, operations, args.repeat)
+            print('{:<45} {:12.2f} us/op {:12.0f} op/s {:10d} B peak'.format(
+                name, result['latency'] * 1e6, result['throughput'] or 0, result['peak_memory']))
+
+    output = {'python': platform.python_version(),
+              'platform': platform.platform(),
+              'qt_platform': os.environ['QT_QPA_PLATFORM'],
+              'sizes': sizes,
+              'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(output, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        if compare(previous, output, args.tolerance):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
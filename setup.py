@@ -63,5 +63,6 @@ setup(
         'qtpy'
     ],
     extras_require={
+        'numpy': ['numpy'],
     },
 )
@@ -0,0 +1,268 @@
+"""
+Bridge between asyncio and the Qt event loop.
+
+An asyncio event loop is run in small steps from the Qt event loop,
+on the GUI thread, so coroutines can update the state and the widgets
+directly, and I/O bound producers never block the GUI.
+
+.. code-block:
+
+    async def lines(path):
+        async for line in read_lines(path):
+            yield line
+
+    feed(lines("log.txt"), state, "last_line")
+
+    async def wait_for_click():
+        await next_value(button.rx.clicked)
+"""
+import asyncio
+import inspect
+import math
+import selectors
+import threading
+
+from qtpy.QtCore import QObject, QSocketNotifier, QTimer
+
+from .common import RxPort
+from .state import RxList, RxMap
+
+
+class _NotifyingSelector(selectors.DefaultSelector):
+    """A selector that watches its files with ``QSocketNotifier`` objects.
+
+    ``activated()`` is called from the Qt event loop whenever
+    one of the registered files is ready.
+    """
+
+    def __init__(self, activated):
+        super().__init__()
+        self._activated = activated
+        self._notifiers = dict()
+
+    def register(self, fileobj, events, data=None):
+        key = super().register(fileobj, events, data)
+        self._watch(key.fd, events)
+        return key
+
+    def unregister(self, fileobj):
+        key = super().unregister(fileobj)
+        self._watch(key.fd, 0)
+        return key
+
+    def modify(self, fileobj, events, data=None):
+        key = super().modify(fileobj, events, data)
+        self._watch(key.fd, key.events)
+        return key
+
+    def _watch(self, fd, events):
+        for event, typ in ((selectors.EVENT_READ, QSocketNotifier.Read),
+                           (selectors.EVENT_WRITE, QSocketNotifier.Write)):
+            notifier = self._notifiers.pop((fd, event), None)
+            if events & event:
+                if notifier is None:
+                    notifier = QSocketNotifier(fd, typ)
+                    notifier.activated.connect(lambda _: self._activated())
+                self._notifiers[(fd, event)] = notifier
+            elif notifier is not None:
+                notifier.setEnabled(False)
+                notifier.deleteLater()
+
+    def close(self):
+        for notifier in self._notifiers.values():
+            notifier.setEnabled(False)
+            notifier.deleteLater()
+        self._notifiers.clear()
+        super().close()
+
+
+class QtAsyncioBridge(QObject):
+    """Runs an asyncio event loop from the Qt event loop.
+
+    The loop is stepped when one of its files becomes ready (watched
+    with ``QSocketNotifier``), when its next timer is due, and when Qt
+    code schedules a callback through the bridge (such as resolving
+    :func:`next_value`); callbacks scheduled on the loop directly from
+    Qt code need a call to :meth:`wake`. A task waiting for I/O doesn't
+    wake up the GUI thread until there is something to read or write.
+
+    A ``loop`` created elsewhere can't notify the bridge, so while it has
+    tasks it is polled every ``interval`` milliseconds, which costs a
+    wake-up of the GUI thread per interval, even when the tasks are idle.
+    """
+
+    def __init__(self, loop=None, interval=5, parent=None):
+        super().__init__(parent)
+        if loop is None:
+            loop = asyncio.SelectorEventLoop(_NotifyingSelector(self.step))
+            asyncio.set_event_loop(loop)
+        self.loop = loop
+        self.polling = not isinstance(getattr(loop, '_selector', None), _NotifyingSelector)
+        self._stepping = False
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.step)
+        self._wake_timer = QTimer(self)
+        self._wake_timer.setSingleShot(True)
+        self._wake_timer.timeout.connect(self.step)
+
+    @property
+    def interval(self):
+        return self._timer.interval()
+
+    @interval.setter
+    def interval(self, interval):
+        self._timer.setInterval(interval)
+
+    def step(self):
+        """Run a single iteration of the asyncio loop, without waiting."""
+        if self._stepping or self.loop.is_closed():
+            return
+        self._stepping = True
+        try:
+            # With stop() already scheduled, run_forever() polls for I/O
+            # with a timeout of zero, runs the ready callbacks and returns
+            self.loop.call_soon(self.loop.stop)
+            self.loop.run_forever()
+        finally:
+            self._stepping = False
+        if self.polling:
+            if asyncio.all_tasks(self.loop):
+                if not self._timer.isActive():
+                    self._timer.start()
+            else:
+                self._timer.stop()
+        elif self.loop._ready:
+            self._wake_in(0)
+        elif self.loop._scheduled:
+            # Wake up when the next timer of the loop is due
+            delay = self.loop._scheduled[0].when() - self.loop.time()
+            self._wake_in(max(0, math.ceil(delay * 1000)))
+
+    def _wake_in(self, msecs):
+        if not self._wake_timer.isActive() or self._wake_timer.remainingTime() > msecs:
+            self._wake_timer.start(msecs)
+
+    def wake(self):
+        """Step the asyncio loop on the next iteration of the Qt event loop."""
+        self._wake_in(0)
+
+    def create_task(self, coro):
+        """Schedule a coroutine on the asyncio loop and return its task."""
+        task = self.loop.create_task(coro)
+        self.wake()
+        return task
+
+    def feed(self, source, target, key=None):
+        """Send the values of an async iterator (or the result of an awaitable) to ``target``.
+
+        ``target`` can be a :class:`RxMap` (with the ``key`` to set),
+        a :class:`RxList` (the values are appended), an observer
+        or a function. Returns the task, which can be cancelled.
+        """
+        return self.create_task(_feed(source, _sink(target, key)))
+
+    def next_value(self, observable):
+        """Returns a future resolved with the next value emitted by the observable or port."""
+        future = self.loop.create_future()
+        subscription = None
+
+        def on_next(value):
+            if not future.done():
+                future.set_result(value)
+                self.wake()
+            if subscription is not None:
+                subscription.dispose()
+
+        def on_error(error):
+            if not future.done():
+                future.set_exception(error)
+                self.wake()
+
+        subscription = _observable(observable).subscribe(on_next, on_error)
+        if future.done():
+            # The value was emitted while subscribing
+            subscription.dispose()
+        return future
+
+    async def values(self, observable):
+        """Asynchronously iterate over the values emitted by an observable or port.
+
+        Values emitted while the consumer is busy are queued.
+        """
+        queue = asyncio.Queue()
+
+        def on_next(value):
+            queue.put_nowait(value)
+            self.wake()
+
+        subscription = _observable(observable).subscribe(on_next)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            subscription.dispose()
+
+    def close(self):
+        """Cancel the remaining tasks and close the asyncio loop."""
+        self._timer.stop()
+        self._wake_timer.stop()
+        tasks = asyncio.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+
+
+def _observable(observable):
+    if isinstance(observable, RxPort):
+        return observable.stream
+    return observable
+
+def _sink(target, key):
+    if isinstance(target, RxMap):
+        return lambda value: target.__setitem__(key, value)
+    if isinstance(target, RxList):
+        return target.append
+    if hasattr(target, 'on_next'):
+        return target.on_next
+    return target
+
+async def _feed(source, emit):
+    if inspect.isawaitable(source):
+        emit(await source)
+    else:
+        async for value in source:
+            emit(value)
+
+
+_bridge = None
+_lock = threading.Lock()
+
+def bridge():
+    """Returns the shared :class:`QtAsyncioBridge`.
+
+    It must be called from the GUI thread.
+    """
+    global _bridge
+    with _lock:
+        if _bridge is None:
+            _bridge = QtAsyncioBridge()
+        return _bridge
+
+def create_task(coro):
+    """Run a coroutine on the shared bridge."""
+    return bridge().create_task(coro)
+
+def feed(source, target, key=None):
+    """Feed ``target`` from an async iterator or awaitable, on the shared bridge."""
+    return bridge().feed(source, target, key)
+
+def next_value(observable):
+    """Await the next value of an observable or port, on the shared bridge."""
+    return bridge().next_value(observable)
+
+def values(observable):
+    """Iterate asynchronously over the values of an observable or port, on the shared bridge."""
+    return bridge().values(observable)
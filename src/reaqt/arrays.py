@@ -0,0 +1,193 @@
+"""
+Reactive containers backed by NumPy arrays.
+
+NumPy is an optional dependency, only needed if this module is imported.
+"""
+import collections
+import enum
+import numbers
+
+import numpy
+from rx.subjects import Subject
+
+from .state import RxContainer
+
+
+class RxArrayEvent(enum.Enum):
+    # The rows in a RxArrayRange have new values
+    change = 0
+    # The array was replaced or changed length; the value is the new length
+    resize = 1
+
+
+class RxArrayRange(collections.namedtuple('RxArrayRange', ['start', 'stop'])):
+    """The rows ``start:stop`` (along the first axis) of an array."""
+
+    __slots__ = ()
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def union(self, other):
+        return RxArrayRange(min(self.start, other.start), max(self.stop, other.stop))
+
+
+class RxArray(RxContainer):
+    """A reactive container backed by a NumPy array.
+
+    Instead of one event per element, each change emits a single
+    ``(RxArrayEvent.change, RxArrayRange(start, stop))`` covering the
+    rows that were written, however many elements that is. Inside a
+    :meth:`RxContainer.batch` the ranges are merged into one event.
+
+    Values are read with the usual NumPy indexing, which returns
+    read-only views, and written with item and slice assignment,
+    the in-place operators or :meth:`update`.
+
+    :meth:`freeze` returns a read-only view of the current values without
+    copying them. The array is only copied if it is modified while a
+    snapshot is alive, so the snapshot never changes.
+    """
+
+    def __init__(self, values, dtype=None):
+        self._set_array(numpy.array(values, dtype=dtype))
+        self._stream = Subject()
+        self.length = Subject()
+        self._pending = None
+        self._parents = []
+
+    def _set_array(self, array):
+        self._array = array
+        self._view = array.view()
+        self._view.flags.writeable = False
+
+    def __len__(self):
+        return len(self._array)
+
+    @property
+    def shape(self):
+        return self._array.shape
+
+    @property
+    def dtype(self):
+        return self._array.dtype
+
+    def __iter__(self):
+        return iter(self._view)
+
+    def __getitem__(self, key):
+        return self._view[key]
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self._view
+        return self._view.astype(dtype)
+
+    def broadcast_length(self):
+        self.length.on_next(len(self._array))
+
+    def _rows(self, key):
+        # The range of rows touched by an index, or None if it is empty
+        n = len(self._array)
+        if isinstance(key, tuple):
+            key = key[0] if key else Ellipsis
+        if key is Ellipsis:
+            return RxArrayRange(0, n) if n else None
+        if isinstance(key, slice):
+            indices = range(*key.indices(n))
+            if not indices:
+                return None
+            first, last = sorted((indices[0], indices[-1]))
+            return RxArrayRange(first, last + 1)
+        if isinstance(key, numbers.Integral):
+            index = range(n)[key]
+            return RxArrayRange(index, index + 1)
+        key = numpy.asarray(key)
+        if key.dtype == bool:
+            # A mask may have more dimensions than rows: keep the rows
+            # that contain at least one selected element
+            rows = numpy.nonzero(key)[0]
+        else:
+            rows = numpy.arange(n)[key]
+        if rows.size == 0:
+            return None
+        return RxArrayRange(int(rows.min()), int(rows.max()) + 1)
+
+    def _writable(self):
+        # Copy on write, if a snapshot shares the current array
+        if self._frozen is not None:
+            self._set_array(self._array.copy())
+        return self._array
+
+    def _emit(self, event):
+        self._changed()
+        if self._batch_depth > 0:
+            if self._pending is None or event[0] == RxArrayEvent.resize:
+                self._pending = event
+            elif self._pending[0] == RxArrayEvent.change:
+                self._pending = (RxArrayEvent.change, self._pending[1].union(event[1]))
+            return
+        self._stream.on_next(event)
+        if event[0] == RxArrayEvent.resize:
+            self.length.on_next(event[1])
+
+    def _flush(self):
+        event = self._pending
+        self._pending = None
+        if event is not None:
+            self._stream.on_next(event)
+            if event[0] == RxArrayEvent.resize:
+                self.length.on_next(event[1])
+
+    def __setitem__(self, key, value):
+        rows = self._rows(key)
+        self._writable()[key] = value
+        if rows is not None:
+            self._emit((RxArrayEvent.change, rows))
+
+    def update(self, func, key=Ellipsis, *args):
+        """Replace the values at ``key`` by ``func(values, *args)``.
+
+        .. code-block:
+
+            samples.update(numpy.clip, slice(0, 1000), -1.0, 1.0)
+        """
+        rows = self._rows(key)
+        array = self._writable()
+        array[key] = func(array[key], *args)
+        if rows is not None:
+            self._emit((RxArrayEvent.change, rows))
+
+    def _inplace(self, op, other):
+        op(self._writable(), other)
+        if len(self._array):
+            self._emit((RxArrayEvent.change, RxArrayRange(0, len(self._array))))
+        return self
+
+    def __iadd__(self, other):
+        return self._inplace(numpy.ndarray.__iadd__, other)
+
+    def __isub__(self, other):
+        return self._inplace(numpy.ndarray.__isub__, other)
+
+    def __imul__(self, other):
+        return self._inplace(numpy.ndarray.__imul__, other)
+
+    def __itruediv__(self, other):
+        return self._inplace(numpy.ndarray.__itruediv__, other)
+
+    def set(self, values):
+        """Replace all the values, possibly with an array of another length."""
+        self._set_array(numpy.array(values, dtype=self._array.dtype))
+        self._emit((RxArrayEvent.resize, len(self._array)))
+
+    def extend(self, values):
+        """Append rows at the end. The whole array is copied."""
+        values = numpy.asarray(values, dtype=self._array.dtype)
+        self._set_array(numpy.concatenate([self._array, values]))
+        self._emit((RxArrayEvent.resize, len(self._array)))
+
+    def freeze(self):
+        if self._frozen is None:
+            self._frozen = self._view
+        return self._frozen
@@ -3,6 +3,8 @@ import contextlib
 from rx import Observer
 from rx.subjects import Subject
 
+from .state import ChangeGate
+
 # from .utils.misc import identity
 
 class FakeObservable(object):
@@ -46,16 +48,36 @@ class RxObserver(Observer):
     and will use their values to update the associated QWidget.
     Some customizations are possible.
 
+    If a ``scheduler`` (such as :class:`reaqt.scheduling.FrameScheduler`)
+    is given, the values are handed to it instead of being applied
+    immediately, and the scheduler decides when to apply them.
+
+    If a ``gate`` (:class:`reaqt.state.ChangeGate`) is set, values
+    that aren't changes are dropped before reaching the QWidget.
+
     This is the Rx equivalent of a Qt Slot.
     """
 
-    def __init__(self, qobject, func, transform=lambda x: x):
+    def __init__(self, qobject, func, transform=lambda x: x, scheduler=None):
         super().__init__()
         self.qobject = qobject
         self.func = func
         self.transform = transform
+        self.scheduler = scheduler
+        self.gate = None
+        # Number of values that were replaced by a newer one before being applied
+        self.coalesced = 0
 
     def on_next(self, value):
+        if self.gate is not None and not self.gate.admit(value):
+            return
+        if self.scheduler is None:
+            self.apply(value)
+        else:
+            self.scheduler.schedule(self, value)
+
+    def apply(self, value):
+        """Update the QWidget with the value, without sending any signals."""
         with signals_blocked(self.qobject):
             self.func(self.transform(value))
 
@@ -77,14 +99,58 @@ class RxObservable(Subject):
         super().__init__()
         self.signal = signal
         self.transform = transform
-        if get is None:
-            self.signal.connect(self.on_next)
+        self.getter = get
+        self.gate = None
+        self.policy = None
+        # The Qt signal is only connected when someone subscribes
+        self.connected = False
+
+    def connect_signal(self):
+        """Start emitting the values sent by the Qt signal.
+
+        This happens automatically on the first subscription.
+        """
+        if self.connected:
+            return
+        self.connected = True
+        # Look up on_next when called, so that it can be instrumented
+        if self.getter is None:
+            self.signal.connect(lambda value: self.on_next(value))
         else:
+            get = self.getter
             self.signal.connect(
                 lambda: self.on_next(get()))
 
+    def _subscribe_core(self, observer):
+        self.connect_signal()
+        return super()._subscribe_core(observer)
+
+    def set_policy(self, policy):
+        """Hold back the values according to an input policy (see
+        :class:`reaqt.scheduling.InputPolicy`), or emit them all
+        at once if ``policy`` is ``None``.
+        """
+        if self.policy is not None:
+            self.policy.flush()
+            self.policy.target = None
+        self.policy = policy
+        if policy is not None:
+            # Look up emit when called, so that it can be instrumented
+            policy.target = lambda value: self.emit(value)
+        return policy
+
     def on_next(self, value):
-        super().on_next(self.transform(value))
+        value = self.transform(value)
+        if self.policy is None:
+            self.emit(value)
+        else:
+            self.policy.push(value)
+
+    def emit(self, value):
+        """Send a value to the subscribers, bypassing the input policy."""
+        if self.gate is not None and not self.gate.admit(value):
+            return
+        super().on_next(value)
 
     def on_completed(self):
         pass
@@ -97,11 +163,44 @@ class RxPort(Subject):
     This class controls associates a QWidget with a reactive value.
 
     It contains a controller and a stream.
+
+    If ``equality`` is given (see :func:`reaqt.state.make_equality`),
+    the controller and the stream share a :class:`reaqt.state.ChangeGate`
+    which remembers the last value in either direction. Values sent
+    to the widget that it already shows, and values sent by the widget
+    that it has just received, are dropped.
     """
 
-    def __init__(self, controller, stream):
+    def __init__(self, controller, stream, equality=None):
         self.controller = controller
         self.stream = stream
+        self.gate = None
+        if equality is not None:
+            self.set_equality(equality)
+
+    def set_equality(self, equality):
+        """Start (or stop, if ``equality`` is ``None``) dropping repeated values."""
+        self.gate = None if equality is None else ChangeGate(equality)
+        self.controller.gate = self.gate
+        if isinstance(self.stream, RxObservable):
+            self.stream.gate = self.gate
+            # The gate must see the changes made by the user
+            self.stream.connect_signal()
+
+    @property
+    def suppressed(self):
+        """The number of values that were dropped because they weren't changes."""
+        return 0 if self.gate is None else self.gate.suppressed
+
+    def set_policy(self, policy):
+        """Set the input policy (see :class:`reaqt.scheduling.InputPolicy`)
+        that decides when the values sent by the widget are emitted.
+
+        .. code-block:
+
+            search.rx.text.set_policy(Throttle(250))
+        """
+        return self.stream.set_policy(policy)
 
 
     def on_next(self, value):
@@ -118,8 +217,40 @@ class RxPort(Subject):
 
 class RxPortManager(object):
     """A class that contains several :class:`RxPort`
+
+    Ports are given the name of the attribute they are assigned to,
+    which is used to identify them (for example, when profiling).
+
+    Ports can also be defined with a function that creates them
+    (see :meth:`RxPortManager.define`), in which case they are only
+    created the first time they are accessed.
     """
-    pass
+
+    def define(self, name, factory):
+        """Define a port that will be created by ``factory()`` when first accessed."""
+        self.__dict__.setdefault('_factories', dict())[name] = factory
+
+    def is_created(self, name):
+        """Returns ``True`` if the port exists (it has already been accessed)."""
+        return name in self.__dict__
+
+    def __getattr__(self, name):
+        # Only called for attributes that don't exist yet
+        factory = self.__dict__.get('_factories', {}).pop(name, None)
+        if factory is None:
+            raise AttributeError(name)
+        setattr(self, name, factory())
+        return self.__dict__[name]
+
+    def __setattr__(self, name, value):
+        if isinstance(value, RxPort):
+            value.name = name
+            value.controller.name = name
+            value.stream.name = name
+            # Streams don't know which widget they belong to
+            if not hasattr(value.stream, 'qobject'):
+                value.stream.qobject = getattr(value.controller, 'qobject', None)
+        super().__setattr__(name, value)
 
 
 def connect_controller(subject, rx_port, right=None, left=None):
@@ -0,0 +1,331 @@
+"""Introspection of the dependency graph formed by the bindings.
+
+While recording is enabled, every subscription made through Rx
+(including the ones made by :func:`reaqt.common.connect`,
+:func:`reaqt.common.connect_controller` and operators such as
+``Observable.combine_latest``) adds edges to a graph whose nodes
+are the keys of :class:`reaqt.state.RxMap` objects, the ports of
+widgets and the other subjects and functions involved.
+
+Operators themselves are not nodes: an edge goes directly from
+each input of an operator to the node that receives its output.
+
+The controller (``set``) and the stream (``emit``) of a port are
+different nodes. The edge between them is marked as ``blocked``,
+because values set by the controller don't produce signals.
+
+.. code-block:
+
+    from reaqt import graph
+
+    graph.enable()
+    widget = BmiWidget()
+    graph.disable()
+    print(graph.cycles())
+    graph.dump_dot('bindings.dot')
+"""
+import collections
+import json
+
+from rx import Observer
+from rx.core import ObservableBase
+from rx.subjects import BehaviorSubject, Subject
+
+from .common import RxObservable, RxObserver, RxPort
+from .profiling import widget_label
+from .state import RxComputed, RxMap
+
+Edge = collections.namedtuple('Edge', ['source', 'target', 'blocked'])
+
+class Graph(object):
+    """A directed graph of reactive nodes."""
+
+    def __init__(self):
+        # Maps node names to their kind
+        self.nodes = collections.OrderedDict()
+        # Maps node names to the names of their successors
+        self.edges = collections.OrderedDict()
+        # Keeps the recorded objects alive, so that ids are never reused
+        self._objects = dict()
+        # Ports for which both the controller and the stream have been seen
+        self._ports = collections.defaultdict(dict)
+
+    def add_node(self, name, kind):
+        if name not in self.nodes:
+            self.nodes[name] = kind
+            self.edges[name] = collections.OrderedDict()
+
+    def add_edge(self, source, target, blocked=False):
+        if source == target:
+            return
+        # An edge that is not blocked replaces a blocked one
+        self.edges[source][target] = self.edges[source].get(target, True) and blocked
+
+    def edge_list(self):
+        return [Edge(source, target, blocked)
+                for source, targets in self.edges.items()
+                for target, blocked in targets.items()]
+
+    # Analysis
+
+    def fan_out(self):
+        """Returns the number of direct successors of each node."""
+        return {node: len(targets) for node, targets in self.edges.items()}
+
+    def _successors(self, node, include_blocked):
+        return [target for target, blocked in self.edges[node].items()
+                if include_blocked or not blocked]
+
+    def strongly_connected(self, include_blocked=False):
+        """Returns the strongly connected components with more than one node (Tarjan)."""
+        index = dict()
+        lowlink = dict()
+        stack = []
+        on_stack = set()
+        components = []
+        counter = [0]
+
+        for root in self.nodes:
+            if root in index:
+                continue
+            # Iterative DFS: each frame is (node, iterator over successors)
+            index[root] = lowlink[root] = counter[0]
+            counter[0] += 1
+            stack.append(root)
+            on_stack.add(root)
+            frames = [(root, iter(self._successors(root, include_blocked)))]
+            while frames:
+                node, successors = frames[-1]
+                advanced = False
+                for target in successors:
+                    if target not in index:
+                        index[target] = lowlink[target] = counter[0]
+                        counter[0] += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        frames.append((target, iter(self._successors(target, include_blocked))))
+                        advanced = True
+                        break
+                    elif target in on_stack:
+                        lowlink[node] = min(lowlink[node], index[target])
+                if advanced:
+                    continue
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        components.append(sorted(component))
+        return components
+
+    def cycles(self):
+        """Returns the groups of nodes that feed back into themselves.
+
+        Each item is a dict with the ``nodes`` in the cycle and whether
+        the cycle is only ``cut_by_signals_blocked`` (it goes through
+        a widget) or would propagate forever.
+        """
+        real = self.strongly_connected(include_blocked=False)
+        real_nodes = set(node for component in real for node in component)
+        result = [{'nodes': component, 'cut_by_signals_blocked': False}
+                  for component in real]
+        for component in self.strongly_connected(include_blocked=True):
+            if not real_nodes.issuperset(component):
+                result.append({'nodes': component, 'cut_by_signals_blocked': True})
+        return result
+
+    def _downstream(self, root, memo):
+        """Returns (depth, updates) for a node, ignoring blocked edges and back edges."""
+        if root in memo:
+            return memo[root]
+        # Iterative post-order DFS: each frame is [node, iterator over
+        # successors, depth, updates], and the nodes on the path are visiting
+        visiting = {root}
+        frames = [[root, iter(self._successors(root, False)), 0, 0]]
+        while frames:
+            frame = frames[-1]
+            for target in frame[1]:
+                if target in visiting:
+                    continue
+                if target not in memo:
+                    visiting.add(target)
+                    frames.append([target, iter(self._successors(target, False)), 0, 0])
+                    break
+                target_depth, target_updates = memo[target]
+                frame[2] = max(frame[2], target_depth + 1)
+                # The target updates once, and then triggers its own updates
+                frame[3] += 1 + target_updates
+            else:
+                node, _, depth, updates = frames.pop()
+                visiting.discard(node)
+                memo[node] = (depth, updates)
+                if frames:
+                    parent = frames[-1]
+                    parent[2] = max(parent[2], depth + 1)
+                    parent[3] += 1 + updates
+        return memo[root]
+
+    def propagation(self):
+        """For each node, the propagation depth and the number of downstream updates.
+
+        The number of updates counts every path, so a node that reaches
+        another node through two different paths counts it twice
+        (as happens with diamond-shaped dependencies).
+        """
+        memo = dict()
+        result = dict()
+        for node in self.nodes:
+            depth, updates = self._downstream(node, memo)
+            result[node] = {'depth': depth, 'updates': updates}
+        return result
+
+    def hotspots(self, threshold=100):
+        """Returns the nodes whose single update triggers at least ``threshold`` updates."""
+        return {node: stats['updates']
+                for node, stats in self.propagation().items()
+                if stats['updates'] >= threshold}
+
+    # Export
+
+    def to_dict(self):
+        propagation = self.propagation()
+        fan_out = self.fan_out()
+        return {'nodes': [{'name': name,
+                           'kind': kind,
+                           'fan_out': fan_out[name],
+                           'depth': propagation[name]['depth'],
+                           'updates': propagation[name]['updates']}
+                          for name, kind in self.nodes.items()],
+                'edges': [edge._asdict() for edge in self.edge_list()],
+                'cycles': self.cycles()}
+
+    def to_dot(self):
+        shapes = {'state': 'box', 'computed': 'octagon', 'set': 'invhouse', 'emit': 'house',
+                  'function': 'ellipse', 'subject': 'diamond'}
+        lines = ['digraph reaqt {']
+        for name, kind in self.nodes.items():
+            lines.append('    {} [shape={}];'.format(json.dumps(name), shapes.get(kind, 'ellipse')))
+        for edge in self.edge_list():
+            style = ' [style=dashed]' if edge.blocked else ''
+            lines.append('    {} -> {}{};'.format(json.dumps(edge.source), json.dumps(edge.target), style))
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+    # Recording
+
+    def node_for(self, obj):
+        """Returns the name of the node for an object, or ``None`` if it isn't a node."""
+        if isinstance(obj, RxPort):
+            obj = obj.controller
+
+        if isinstance(obj, RxObserver):
+            port = '{}.{}'.format(widget_label(obj.qobject), getattr(obj, 'name', None) or '?')
+            name, kind = port + ' (set)', 'set'
+        elif isinstance(obj, RxObservable):
+            port = '{}.{}'.format(widget_label(getattr(obj, 'qobject', None)),
+                                  getattr(obj, 'name', None) or '?')
+            name, kind = port + ' (emit)', 'emit'
+        elif isinstance(obj, (Subject, BehaviorSubject)):
+            name, kind = None, 'computed' if isinstance(obj, RxComputed) else 'subject'
+            for parent in getattr(obj, '_parents', ()):
+                if isinstance(parent, RxMap):
+                    for key, value in parent._streams.items():
+                        if value is obj:
+                            name = 'RxMap#{:x}[{!r}]'.format(id(parent), key)
+                            if kind == 'subject':
+                                kind = 'state'
+            if name is None:
+                name = '{}#{:x}'.format(type(obj).__name__, id(obj))
+        elif callable(obj) and not isinstance(obj, Observer):
+            owner = getattr(obj, '__self__', None)
+            if owner is not None and not isinstance(owner, type):
+                # A bound method, such as subject.on_next
+                return self.node_for(owner)
+            module = getattr(obj, '__module__', None) or ''
+            if module == 'rx' or module.startswith('rx.'):
+                # A function created by an operator
+                return None
+            name, kind = 'function {}'.format(getattr(obj, '__qualname__', repr(obj))), 'function'
+        else:
+            return None
+
+        self._objects[id(obj)] = obj
+        self.add_node(name, kind)
+        if kind in ('set', 'emit'):
+            # Values set on a widget reach its stream only if signals aren't blocked
+            self._ports[port][kind] = name
+            if len(self._ports[port]) == 2:
+                self.add_edge(self._ports[port]['set'], self._ports[port]['emit'], blocked=True)
+        return name
+
+
+_graph = Graph()
+_original_subscribe = None
+# The node that receives the values of the subscription being made
+_targets = []
+
+def _recording_subscribe(self, on_next=None, on_error=None, on_completed=None, observer=None):
+    receiver = observer if observer is not None else on_next
+    target = _graph.node_for(receiver) if receiver is not None else None
+    if target is None and _targets:
+        # An anonymous observer, created by an operator on behalf of the
+        # observer that is subscribing to the operator
+        target = _targets[-1]
+    source = _graph.node_for(self) if isinstance(self, (Subject, BehaviorSubject)) else None
+    if source is not None and target is not None:
+        _graph.add_edge(source, target)
+
+    _targets.append(target)
+    try:
+        return _original_subscribe(self, on_next, on_error, on_completed, observer)
+    finally:
+        _targets.pop()
+
+
+def is_enabled():
+    return _original_subscribe is not None
+
+def enable():
+    """Start recording the bindings that are made."""
+    global _original_subscribe
+    if _original_subscribe is None:
+        _original_subscribe = ObservableBase.subscribe
+        ObservableBase.subscribe = _recording_subscribe
+
+def disable():
+    """Stop recording (the graph recorded so far is kept)."""
+    global _original_subscribe
+    if _original_subscribe is not None:
+        ObservableBase.subscribe = _original_subscribe
+        _original_subscribe = None
+
+def reset():
+    """Forget the recorded graph."""
+    global _graph
+    _graph = Graph()
+
+def graph():
+    """Returns the recorded :class:`Graph`."""
+    return _graph
+
+def cycles():
+    return _graph.cycles()
+
+def hotspots(threshold=100):
+    return _graph.hotspots(threshold)
+
+def dump_json(path):
+    with open(path, 'w') as f:
+        json.dump(_graph.to_dict(), f, indent=2)
+
+def dump_dot(path):
+    with open(path, 'w') as f:
+        f.write(_graph.to_dot())
@@ -0,0 +1,206 @@
+"""
+Undo and redo of the changes made to the state.
+
+Instead of keeping snapshots of the whole state, a :class:`History`
+records the inverse of each change, so its memory grows with the size
+of the edits, not with the size of the state.
+
+.. code-block:
+
+    history = History(state)
+    with history.step("Add rows"):
+        state['rows'].append(row)
+        state['count'] = len(state['rows'])
+    history.undo()
+"""
+import collections
+import contextlib
+
+from rx.subjects import Subject
+
+from .state import RxComputed, RxContainer, RxList, RxListEvent, RxMap
+
+
+class HistoryStep(collections.namedtuple('HistoryStep', ['label', 'operations'])):
+    """A user-level step, as the list of operations that undo (or redo) it."""
+
+    __slots__ = ()
+
+
+class History(object):
+    """Undo and redo history of the changes made to a :class:`RxMap`.
+
+    The values of the keys of the map (and of the maps nested in it)
+    and the changes to the :class:`RxList` objects in it are recorded.
+    Changes made inside :meth:`step` are undone together; other changes
+    are undone one at a time. At most ``limit`` steps are kept.
+
+    Undoing a step applies its operations inside a batch,
+    so no intermediate state is emitted.
+    ``status`` emits ``(can_undo, can_redo)`` whenever they change.
+    """
+
+    def __init__(self, state, limit=100):
+        self.state = state
+        self.limit = limit
+        self.undo_stack = collections.deque()
+        self.redo_stack = []
+        self.status = Subject()
+        # The last value of each stream, which is the value to restore
+        self._values = dict()
+        # A copy of each list, to know the items that were removed
+        self._mirrors = dict()
+        self._subscriptions = []
+        self._step = None
+        self._step_depth = 0
+        self._follow(state)
+
+    def _follow(self, container):
+        if isinstance(container, RxMap):
+            for key, value in container._streams.items():
+                if isinstance(value, (RxMap, RxList)):
+                    self._follow(value)
+                elif not isinstance(value, (RxContainer, RxComputed)):
+                    self._values[value] = value.current_value
+                    self._subscriptions.append(value.subscribe(
+                        lambda v, m=container, k=key, s=value: self._record_set(m, k, s, v)))
+        elif isinstance(container, RxList):
+            self._mirrors[container] = list(container._list)
+            self._subscriptions.append(container._stream.subscribe(
+                lambda event, l=container: self._record_list(l, event)))
+
+    @property
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def _record_set(self, rx_map, key, stream, value):
+        old = self._values[stream]
+        self._values[stream] = value
+        if old is not value:
+            self._record(('set', rx_map, key, old))
+
+    def _record_list(self, rx_list, event):
+        typ, value = event
+        if typ == RxListEvent.batch:
+            for sub_event in value:
+                self._record_list(rx_list, sub_event)
+            return
+
+        # Every event is a splice of the mirror
+        mirror = self._mirrors[rx_list]
+        if typ == RxListEvent.append:
+            start, removed, inserted = len(mirror), 0, [value]
+        elif typ == RxListEvent.extend:
+            start, removed, inserted = len(mirror), 0, list(value)
+        elif typ == RxListEvent.insert:
+            start, removed, inserted = value[0], 0, [value[1]]
+        elif typ in (RxListEvent.pop, RxListEvent.delitem):
+            start, removed, inserted = value, 1, []
+        elif typ == RxListEvent.clear:
+            start, removed, inserted = 0, len(mirror), []
+        elif typ in (RxListEvent.sort, RxListEvent.reverse):
+            start, removed, inserted = 0, len(mirror), list(value)
+        elif typ == RxListEvent.splice:
+            start, removed, inserted = value.start, value.removed, list(value.inserted)
+        else:
+            return
+        old = mirror[start:start + removed]
+        mirror[start:start + removed] = inserted
+        self._record(('splice', rx_list, start, len(inserted), old))
+
+    def _record(self, operation):
+        if self._step is not None:
+            self._step.operations.append(operation)
+            return
+        # A change made outside of a step, which is a step of its own
+        self._push(self.undo_stack, HistoryStep(None, [operation]))
+        self.redo_stack = []
+        self._notify()
+
+    def _push(self, stack, step):
+        stack.append(step)
+        if stack is self.undo_stack and self.limit is not None and len(stack) > self.limit:
+            stack.popleft()
+
+    def _notify(self):
+        self.status.on_next((self.can_undo, self.can_redo))
+
+    @contextlib.contextmanager
+    def step(self, label=None):
+        """Group the changes made inside the block into a single step.
+
+        The state is batched during the block. Steps can be nested;
+        the changes are then part of the outermost step.
+        """
+        if self._step_depth == 0:
+            self._step = HistoryStep(label, [])
+        self._step_depth += 1
+        try:
+            with self.state.batch():
+                yield self._step
+        finally:
+            self._step_depth -= 1
+            if self._step_depth == 0:
+                step, self._step = self._step, None
+                if step.operations:
+                    self._push(self.undo_stack, step)
+                    self.redo_stack = []
+                    self._notify()
+
+    def _replay(self, step):
+        # Apply the operations from the last one, recording their inverses
+        self._step = HistoryStep(step.label, [])
+        try:
+            with self.state.batch():
+                for operation in reversed(step.operations):
+                    if operation[0] == 'set':
+                        _, rx_map, key, value = operation
+                        rx_map[key] = value
+                    else:
+                        _, rx_list, start, count, items = operation
+                        rx_list.splice(start, start + count, items)
+            return self._step
+        finally:
+            self._step = None
+
+    @property
+    def undo_label(self):
+        """The label of the step that :meth:`undo` would undo."""
+        return self.undo_stack[-1].label if self.undo_stack else None
+
+    @property
+    def redo_label(self):
+        """The label of the step that :meth:`redo` would redo."""
+        return self.redo_stack[-1].label if self.redo_stack else None
+
+    def undo(self):
+        """Undo the last step. Returns ``False`` if there was nothing to undo."""
+        if not self.undo_stack or self._step is not None:
+            return False
+        self._push(self.redo_stack, self._replay(self.undo_stack.pop()))
+        self._notify()
+        return True
+
+    def redo(self):
+        """Redo the last undone step. Returns ``False`` if there was nothing to redo."""
+        if not self.redo_stack or self._step is not None:
+            return False
+        self._push(self.undo_stack, self._replay(self.redo_stack.pop()))
+        self._notify()
+        return True
+
+    def clear(self):
+        """Forget all the steps."""
+        self.undo_stack.clear()
+        self.redo_stack = []
+        self._notify()
+
+    def close(self):
+        """Stop recording the changes."""
+        for subscription in self._subscriptions:
+            subscription.dispose()
+        self._subscriptions = []
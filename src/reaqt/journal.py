@@ -0,0 +1,225 @@
+"""
+Persistence of the state as a journal of changes.
+
+Instead of serializing the whole state on every save, a :class:`Journal`
+appends one small record per change to a file, and from time to time
+compacts them into a snapshot of the whole state. The state is restored
+by loading the snapshot and replaying the records written after it.
+
+.. code-block:
+
+    state = RxMap({'name': '', 'items': RxList([])})
+    journal = Journal(state, 'state.journal')
+    # Call journal.flush() when the records should reach the disk,
+    # for example from a QTimer
+"""
+import json
+import os
+
+from .state import Nothing, RxComputed, RxContainer, RxList, RxListEvent, RxMap
+
+
+class Journal(object):
+    """An append-only journal of the changes made to a :class:`RxMap`.
+
+    The changes to the keys of the map (and of the maps nested in it)
+    and to the :class:`RxList` objects in it are written to ``path``,
+    one JSON record per line. After ``snapshot_every`` records, the whole
+    state is written to ``path + '.snapshot'`` and the journal is emptied.
+
+    If ``restore`` is true and the files exist, the state is first
+    restored from them; otherwise they are replaced by a snapshot
+    of the current state.
+
+    Computed values and containers other than :class:`RxMap` and
+    :class:`RxList` aren't saved. Containers added to the state after
+    the journal was created aren't followed.
+    """
+
+    def __init__(self, state, path, snapshot_every=1000, restore=True,
+                 dumps=json.dumps, loads=json.loads):
+        self.state = state
+        self.path = path
+        self.snapshot_path = path + '.snapshot'
+        self.snapshot_every = snapshot_every
+        self.dumps = dumps
+        self.loads = loads
+        # Sequence number of the last record
+        self.seq = 0
+        # Records written since the last snapshot
+        self.records = 0
+        self._recording = False
+        self._subscriptions = []
+        self._containers = []
+        self._file = None
+
+        self._follow(state, ())
+        if restore and os.path.exists(self.snapshot_path):
+            self.restore()
+            self._file = open(self.path, 'a')
+        else:
+            self.snapshot()
+        self._recording = True
+
+    def _follow(self, container, path):
+        self._containers.append(container)
+        if isinstance(container, RxMap):
+            for key, value in container._streams.items():
+                if isinstance(value, (RxMap, RxList)):
+                    self._follow(value, path + (key,))
+                elif not isinstance(value, (RxContainer, RxComputed)):
+                    self._subscriptions.append(
+                        value.subscribe(lambda v, p=path + (key,): self._record('set', p, v)))
+        elif isinstance(container, RxList):
+            self._subscriptions.append(
+                container._stream.subscribe(lambda event, p=path: self._record_list(p, event)))
+
+    def _record_list(self, path, event):
+        if not self._recording:
+            return
+        self._write_list(path, event)
+        # A batch event is only checked once all of its changes are written,
+        # since the list already holds all of them
+        self._check_snapshot()
+
+    def _write_list(self, path, event):
+        typ, value = event
+        if typ == RxListEvent.batch:
+            for sub_event in value:
+                self._write_list(path, sub_event)
+        elif typ in (RxListEvent.sort, RxListEvent.reverse):
+            self._write('reset', path, list(value))
+        elif typ == RxListEvent.insert:
+            self._write('insert', path, *value)
+        elif typ == RxListEvent.splice:
+            self._write('splice', path, value.start, value.removed, list(value.inserted))
+        elif typ == RxListEvent.clear:
+            self._write('clear', path)
+        else:
+            self._write(typ.name, path, value)
+
+    def _record(self, op, path, *args):
+        if not self._recording:
+            return
+        self._write(op, path, *args)
+        self._check_snapshot()
+
+    def _write(self, op, path, *args):
+        self.seq += 1
+        self._file.write(self.dumps([self.seq, op, list(path)] + list(args)))
+        self._file.write('\n')
+        self.records += 1
+
+    def _check_snapshot(self):
+        # Inside a batch, the containers may already hold changes
+        # that haven't been recorded yet, so the snapshot must wait
+        if self.records >= self.snapshot_every and \
+                not any(container._batch_depth for container in self._containers):
+            self.snapshot()
+
+    def flush(self, sync=False):
+        """Write the buffered records to the file (and to the disk, if ``sync``)."""
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def snapshot(self):
+        """Write the whole state to the snapshot file, and empty the journal."""
+        if self._file is not None:
+            self._file.close()
+        data = self.dumps({'seq': self.seq, 'state': _plain(self.state)})
+        # The old snapshot is only replaced once the new one is complete;
+        # records older than the snapshot are skipped when restoring.
+        temporary = self.snapshot_path + '.tmp'
+        with open(temporary, 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.snapshot_path)
+        self._file = open(self.path, 'w')
+        self.records = 0
+
+    def restore(self):
+        """Load the snapshot and replay the journal into the state.
+
+        The state is updated in a single batch.
+        """
+        recording = self._recording
+        self._recording = False
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = self.loads(f.read())
+            self.seq = snapshot['seq']
+            self.records = 0
+            with self.state.batch():
+                _load(self.state, snapshot['state'])
+                if os.path.exists(self.path):
+                    with open(self.path) as f:
+                        for line in f:
+                            if not line.endswith('\n'):
+                                # A record cut short by a crash
+                                break
+                            record = self.loads(line)
+                            if record[0] <= self.seq:
+                                continue
+                            self._replay(*record)
+        finally:
+            self._recording = recording
+
+    def _replay(self, seq, op, path, *args):
+        self.seq = seq
+        self.records += 1
+        target = self.state
+        if op == 'set':
+            path, key = path[:-1], path[-1]
+        for part in path:
+            target = target[part]
+
+        if op == 'set':
+            target[key] = args[0]
+        elif op == 'reset':
+            target.splice(0, len(target), args[0])
+        elif op == 'insert':
+            target.insert(*args)
+        elif op == 'splice':
+            start, removed, inserted = args
+            target.splice(start, start + removed, inserted)
+        elif op == 'clear':
+            target.clear()
+        elif op == 'delitem':
+            del target[args[0]]
+        else:
+            # append, extend and pop
+            getattr(target, op)(*args)
+
+    def close(self):
+        """Stop recording the changes and close the file."""
+        self._recording = False
+        for subscription in self._subscriptions:
+            subscription.dispose()
+        self._subscriptions = []
+        self._file.close()
+
+
+def _plain(container):
+    # The saved values of a container, as plain lists and dicts
+    if isinstance(container, RxMap):
+        d = dict()
+        for key, value in container._streams.items():
+            if isinstance(value, (RxMap, RxList)):
+                d[key] = _plain(value)
+            elif not isinstance(value, (RxContainer, RxComputed)) and value.current_value is not Nothing:
+                d[key] = value.current_value
+        return d
+    return list(container)
+
+def _load(container, data):
+    if isinstance(container, RxMap):
+        for key, value in data.items():
+            target = container._streams.get(key)
+            if isinstance(target, (RxMap, RxList)):
+                _load(target, value)
+            elif target is not None and not isinstance(target, (RxContainer, RxComputed)):
+                container[key] = value
+    elif isinstance(container, RxList):
+        container.splice(0, len(container), data)
@@ -0,0 +1,386 @@
+from qtpy.QtCore import *
+
+from rx.subjects import Subject
+
+from .state import RxListEvent, RxTableEvent, RxTableRange, merge_ranges
+
+
+class RxListModel(QAbstractListModel):
+    """A Qt item model that mirrors a :class:`RxList`.
+
+    Each :class:`RxListEvent` is translated into the matching
+    row insertion, row removal or layout change, so that views
+    only update the rows that have actually changed.
+
+    The text shown for each item is given by ``display``. Other roles
+    can be supplied in ``roles``, a dict from Qt roles to functions
+    of the item.
+    """
+
+    def __init__(self, rx_list, display=str, roles=None, parent=None):
+        super().__init__(parent)
+        self.rx_list = rx_list
+        self.roles = dict(roles or {})
+        self.roles[Qt.DisplayRole] = display
+        # Editable views (such as combo boxes) show the edit role
+        self.roles.setdefault(Qt.EditRole, display)
+        # The model keeps its own copy of the items, so that it
+        # reports the old rows until the views have been notified.
+        self._items = list(rx_list._list)
+        # Maps each item to its first row; built when needed
+        self._rows = None
+        self.controller = RxListModelController(self)
+        self.rx_list._stream.subscribe(self.controller)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        func = self.roles.get(role)
+        if func is None:
+            return None
+        return func(self._items[index.row()])
+
+    def item(self, row):
+        """Returns the item in the given row."""
+        return self._items[row]
+
+    def row_of(self, item):
+        """Returns the first row showing ``item``, or -1.
+
+        Hashable items are looked up in an index, which is updated
+        when rows are added or removed at the end, and rebuilt
+        on the next lookup after any other change.
+        """
+        try:
+            if self._rows is None:
+                rows = dict()
+                for row, x in enumerate(self._items):
+                    rows.setdefault(x, row)
+                self._rows = rows
+            return self._rows.get(item, -1)
+        except TypeError:
+            # Unhashable items
+            self._rows = None
+            try:
+                return self._items.index(item)
+            except ValueError:
+                return -1
+
+    def _insert_rows(self, first, items):
+        if not items:
+            return
+        if self._rows is not None and first == len(self._items):
+            try:
+                for row, x in enumerate(items, first):
+                    self._rows.setdefault(x, row)
+            except TypeError:
+                self._rows = None
+        else:
+            self._rows = None
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        self._items[first:first] = items
+        self.endInsertRows()
+
+    def _remove_rows(self, first, last):
+        if self._rows is not None and last == len(self._items) - 1:
+            # The index holds first rows, so an item in the removed rows
+            # either appears before them or is gone
+            for x in self._items[first:]:
+                if self._rows.get(x, -1) >= first:
+                    del self._rows[x]
+        else:
+            self._rows = None
+        self.beginRemoveRows(QModelIndex(), first, last)
+        del self._items[first:last + 1]
+        self.endRemoveRows()
+
+    def _replace_rows(self, first, items):
+        self._rows = None
+        self._items[first:first + len(items)] = items
+        self.dataChanged.emit(self.index(first), self.index(first + len(items) - 1))
+
+    def _relayout(self, items):
+        """Reorder the rows, keeping persistent indices attached to their items."""
+        self.layoutAboutToBeChanged.emit()
+        # Items are matched by identity, so that equal items keep their order
+        new_rows = dict()
+        for row, item in enumerate(items):
+            new_rows.setdefault(id(item), []).append(row)
+        for rows in new_rows.values():
+            rows.reverse()
+        mapping = [new_rows[id(item)].pop() for item in self._items]
+        self._items = items
+        self._rows = None
+
+        old_indices = self.persistentIndexList()
+        new_indices = [self.index(mapping[index.row()], index.column())
+                       for index in old_indices]
+        self.changePersistentIndexList(old_indices, new_indices)
+        self.layoutChanged.emit()
+
+
+class IncrementalFilterModel(QStringListModel):
+    """The texts of the rows of another list model that contain a string.
+
+    While the string is being typed, each new string contains the previous
+    one, so only the rows that matched the previous string are searched.
+    The texts of the source rows are read once and cached until the source
+    model changes. Nothing is shown until there is a string to look for.
+
+    It is a :class:`QStringListModel`, so that views and completers
+    read the matching texts without calling back into Python.
+    """
+
+    def __init__(self, source, case_sensitive=False, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.case_sensitive = case_sensitive
+        self._text = ''
+        # Matching source rows
+        self._matches = []
+        self._texts = None
+        self._keys = None
+        for signal in (source.rowsInserted, source.rowsRemoved, source.dataChanged,
+                       source.layoutChanged, source.modelReset):
+            signal.connect(self._source_changed)
+
+    def _source_keys(self):
+        if self._keys is None:
+            if isinstance(self.source, RxListModel):
+                display = self.source.roles[Qt.DisplayRole]
+                self._texts = [str(display(item)) for item in self.source._items]
+            else:
+                self._texts = [str(self.source.index(row, 0).data())
+                               for row in range(self.source.rowCount())]
+            if self.case_sensitive:
+                self._keys = self._texts
+            else:
+                self._keys = [text.lower() for text in self._texts]
+        return self._keys
+
+    def _source_changed(self, *args):
+        self._texts = self._keys = None
+        if self._text:
+            self.set_filter(self._text, incremental=False)
+
+    def set_filter(self, text, incremental=True):
+        """Only show the rows whose text contains ``text``."""
+        if not self.case_sensitive:
+            text = text.lower()
+        if not text:
+            matches = []
+        else:
+            keys = self._source_keys()
+            if incremental and self._text and text.startswith(self._text):
+                matches = [row for row in self._matches if text in keys[row]]
+            else:
+                matches = [row for row, key in enumerate(keys) if text in key]
+        self._text = text
+        self._matches = matches
+        texts = self._texts
+        self.setStringList([texts[row] for row in matches])
+
+    def source_row(self, row):
+        """Returns the row of the source model shown in ``row``."""
+        return self._matches[row]
+
+
+class RxListModelController(Subject):
+    """Applies the events of a :class:`RxList` to a :class:`RxListModel`."""
+
+    def __init__(self, model):
+        super(Subject, self).__init__()
+        self.model = model
+
+    def on_next(self, event):
+        typ, value = event
+        model = self.model
+
+        if typ == RxListEvent.batch:
+            for sub_event in value:
+                self.on_next(sub_event)
+
+        elif typ == RxListEvent.append:
+            model._insert_rows(len(model._items), [value])
+
+        elif typ == RxListEvent.extend:
+            # RxList.extend() emits a list of the items
+            model._insert_rows(len(model._items), value)
+
+        elif typ == RxListEvent.insert:
+            i, x = value
+            model._insert_rows(i, [x])
+
+        elif typ == RxListEvent.pop:
+            model._remove_rows(value, value)
+
+        elif typ == RxListEvent.delitem:
+            model._remove_rows(value, value)
+
+        elif typ == RxListEvent.splice:
+            start, removed, inserted = value
+            if removed and removed == len(inserted):
+                model._replace_rows(start, inserted)
+            else:
+                if removed:
+                    model._remove_rows(start, start + removed - 1)
+                model._insert_rows(start, list(inserted))
+
+        elif typ == RxListEvent.clear:
+            if model._items:
+                model._remove_rows(0, len(model._items) - 1)
+
+        elif typ == RxListEvent.reverse or typ == RxListEvent.sort:
+            model._relayout(list(value))
+
+
+class RxTableModel(QAbstractTableModel):
+    """A Qt table model that mirrors a :class:`RxTable`.
+
+    Rows are inserted and removed with the matching model signals.
+    Changed cells are reported with ``dataChanged`` over as few
+    rectangles as possible (see :func:`merge_ranges`).
+    If ``coalesce`` is true, the changes are collected until control
+    returns to the event loop, so that a stream of updates repaints
+    the view once.
+
+    ``formats`` is a dict from columns (names or positions) to functions
+    returning the text shown for a value. If ``editable`` is true, the
+    values edited in the views are written to the table.
+    """
+
+    def __init__(self, table, formats=None, editable=False, coalesce=True, parent=None):
+        super().__init__(parent)
+        self.table = table
+        self.formats = {table.column(column): func for column, func in (formats or {}).items()}
+        self.editable = editable
+        # The rows are shared with the table, but the model keeps its own
+        # list of them, so that it reports the old rows until the views
+        # have been notified.
+        self._rows = list(table._rows)
+        self.controller = RxTableModelController(self, coalesce)
+        self.table._stream.subscribe(self.controller)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.table.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            func = self.formats.get(index.column())
+            return value if func is None else func(value)
+        if role == Qt.EditRole:
+            return value
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not self.editable or role != Qt.EditRole or not index.isValid():
+            return False
+        try:
+            self.table[index.row(), index.column()] = value
+        except (ValueError, TypeError):
+            # A value that the column type can't convert; the view keeps the old one
+            return False
+        return True
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.editable and index.isValid():
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return str(self.table.columns[section])
+        return super().headerData(section, orientation, role)
+
+    def _insert_rows(self, first, rows):
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows[first:first] = rows
+        self.endInsertRows()
+
+    def _remove_rows(self, first, count):
+        self.beginRemoveRows(QModelIndex(), first, first + count - 1)
+        del self._rows[first:first + count]
+        self.endRemoveRows()
+
+    def _reset(self, rows):
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+
+class RxTableModelController(Subject):
+    """Applies the events of a :class:`RxTable` to a :class:`RxTableModel`."""
+
+    def __init__(self, model, coalesce=True):
+        super(Subject, self).__init__()
+        self.model = model
+        self.pending = []
+        self.timer = None
+        if coalesce:
+            self.timer = QTimer(model)
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.flush)
+
+    def on_next(self, event):
+        typ, value = event
+        if typ == RxTableEvent.batch:
+            for sub_event in value:
+                self._apply(sub_event)
+        else:
+            self._apply(event)
+
+        if self.timer is None:
+            self.flush()
+        elif self.pending and not self.timer.isActive():
+            self.timer.start(0)
+
+    def _apply(self, event):
+        typ, value = event
+        model = self.model
+        table = model.table
+
+        if typ == RxTableEvent.cell:
+            row, column = value
+            self.pending.append(RxTableRange(row, column, row + 1, column + 1))
+
+        elif typ == RxTableEvent.row:
+            self.pending.append(RxTableRange(value, 0, value + 1, len(table.columns)))
+
+        elif typ == RxTableEvent.range:
+            self.pending.append(value)
+
+        else:
+            # The pending changes refer to the current rows
+            self.flush()
+            if typ == RxTableEvent.insert:
+                start, rows = value
+                model._insert_rows(start, rows)
+            elif typ == RxTableEvent.remove:
+                start, count = value
+                model._remove_rows(start, count)
+            elif typ == RxTableEvent.clear:
+                model._reset([])
+
+    def flush(self):
+        """Emit ``dataChanged`` for the pending changes."""
+        ranges = merge_ranges(self.pending)
+        self.pending = []
+        model = self.model
+        for r in ranges:
+            model.dataChanged.emit(model.index(r.top, r.left), model.index(r.bottom - 1, r.right - 1))
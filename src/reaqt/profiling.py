@@ -0,0 +1,193 @@
+"""Opt-in instrumentation of the reactive ports.
+
+While profiling is enabled, every :class:`reaqt.common.RxObserver`
+and :class:`reaqt.common.RxObservable` records how many values
+went through it and how long they took. When it is disabled,
+the instrumented methods are removed, so there is no cost at all.
+
+.. code-block:
+
+    from reaqt import profiling
+
+    profiling.enable()
+    ...
+    profiling.dump('profile.json')
+"""
+import bisect
+import contextlib
+import json
+import time
+
+from rx.subjects import Subject
+
+from .common import RxObservable, RxObserver, signals_blocked
+
+# Upper bounds of the histogram buckets, in microseconds
+BUCKETS = (10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 500000)
+
+class Histogram(object):
+    """A histogram of durations, with logarithmic buckets."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds * 1e6)] += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def to_dict(self):
+        labels = ['<={}us'.format(bound) for bound in BUCKETS] + ['>{}us'.format(BUCKETS[-1])]
+        return {'buckets': dict(zip(labels, self.counts)),
+                'total': self.total,
+                'max': self.max}
+
+
+class PortStats(object):
+    """The measurements for a single port of a widget.
+
+    ``updates`` are values sent to the widget (through the controller),
+    and ``emissions`` are values sent by the widget (through the stream).
+    """
+
+    def __init__(self):
+        self.updates = 0
+        self.emissions = 0
+        self.transform_time = 0.0
+        self.setter_time = 0.0
+        self.propagation_time = 0.0
+        self.update_latency = Histogram()
+        self.emission_latency = Histogram()
+
+    def to_dict(self):
+        return {'updates': self.updates,
+                'emissions': self.emissions,
+                'transform_time': self.transform_time,
+                'setter_time': self.setter_time,
+                'propagation_time': self.propagation_time,
+                'update_latency': self.update_latency.to_dict(),
+                'emission_latency': self.emission_latency.to_dict()}
+
+
+_stats = dict()
+_originals = dict()
+
+def widget_label(qobject):
+    """A readable name for a widget: its class and its object name (or id)."""
+    if qobject is None:
+        return '?'
+    name = qobject.objectName() or '{:x}'.format(id(qobject))
+    return '{}#{}'.format(type(qobject).__name__, name)
+
+def stats_for(obj):
+    """Returns the :class:`PortStats` for an observer or an observable."""
+    key = obj.__dict__.get('_profile_key')
+    if key is None:
+        key = obj._profile_key = (widget_label(getattr(obj, 'qobject', None)),
+                                  getattr(obj, 'name', None) or '?')
+    stats = _stats.get(key)
+    if stats is None:
+        stats = _stats[key] = PortStats()
+    return stats
+
+
+def _profiled_apply(observer, value):
+    # Same as RxObserver.apply, with timings
+    stats = stats_for(observer)
+    start = time.perf_counter()
+    with signals_blocked(observer.qobject):
+        value = observer.transform(value)
+        transformed = time.perf_counter()
+        observer.func(value)
+    end = time.perf_counter()
+    stats.updates += 1
+    stats.transform_time += transformed - start
+    stats.setter_time += end - transformed
+    stats.update_latency.add(end - start)
+
+def _profiled_on_next(observable, value):
+    # Same as RxObservable.on_next, with timings
+    stats = stats_for(observable)
+    start = time.perf_counter()
+    value = observable.transform(value)
+    stats.transform_time += time.perf_counter() - start
+    if observable.policy is None:
+        observable.emit(value)
+    else:
+        observable.policy.push(value)
+
+def _profiled_emit(observable, value):
+    # Same as RxObservable.emit, with timings
+    if observable.gate is not None and not observable.gate.admit(value):
+        return
+    stats = stats_for(observable)
+    start = time.perf_counter()
+    Subject.on_next(observable, value)
+    end = time.perf_counter()
+    stats.emissions += 1
+    stats.propagation_time += end - start
+    stats.emission_latency.add(end - start)
+
+
+def is_enabled():
+    return bool(_originals)
+
+def enable():
+    """Start recording measurements."""
+    if _originals:
+        return
+    _originals[RxObserver, 'apply'] = RxObserver.__dict__['apply']
+    _originals[RxObservable, 'on_next'] = RxObservable.__dict__['on_next']
+    _originals[RxObservable, 'emit'] = RxObservable.__dict__['emit']
+    RxObserver.apply = _profiled_apply
+    RxObservable.on_next = _profiled_on_next
+    RxObservable.emit = _profiled_emit
+
+def disable():
+    """Stop recording measurements (the ones already recorded are kept)."""
+    for (cls, name), method in _originals.items():
+        setattr(cls, name, method)
+    _originals.clear()
+
+def reset():
+    """Forget all measurements."""
+    _stats.clear()
+
+@contextlib.contextmanager
+def profiled():
+    """Record measurements only inside the block."""
+    enable()
+    try:
+        yield
+    finally:
+        disable()
+
+
+def report():
+    """Returns the measurements for each port, as a dict keyed by ``'widget.port'``."""
+    return {'{}.{}'.format(widget, port): stats.to_dict()
+            for (widget, port), stats in sorted(_stats.items())}
+
+def report_by_widget():
+    """Returns the measurements added up for each widget."""
+    widgets = dict()
+    for (widget, port), stats in _stats.items():
+        total = widgets.setdefault(widget, {'updates': 0,
+                                            'emissions': 0,
+                                            'transform_time': 0.0,
+                                            'setter_time': 0.0,
+                                            'propagation_time': 0.0})
+        total['updates'] += stats.updates
+        total['emissions'] += stats.emissions
+        total['transform_time'] += stats.transform_time
+        total['setter_time'] += stats.setter_time
+        total['propagation_time'] += stats.propagation_time
+    return widgets
+
+def dump(path):
+    """Write the measurements to a JSON file."""
+    with open(path, 'w') as f:
+        json.dump({'ports': report(), 'widgets': report_by_widget()}, f, indent=2)
@@ -0,0 +1,445 @@
+import concurrent.futures
+import threading
+
+from qtpy.QtCore import QCoreApplication, QObject, QTimer, Qt, Signal, Slot
+
+from rx import Observable
+from rx.concurrency import ThreadPoolScheduler
+from rx.concurrency.schedulerbase import SchedulerBase
+from rx.disposables import AnonymousDisposable, BooleanDisposable, CompositeDisposable, SingleAssignmentDisposable
+
+from .state import Nothing
+
+
+class FrameScheduler(QObject):
+    """Coalesces the updates of :class:`reaqt.common.RxObserver` objects.
+
+    Values are queued per observer, and only the last one is applied,
+    once per event-loop tick (if ``interval`` is 0) or once every
+    ``interval`` milliseconds.
+
+    .. code-block:
+
+        scheduler = FrameScheduler(interval=16)
+        scheduler.attach(label.rx.text, slider.rx.value)
+    """
+
+    def __init__(self, interval=0, parent=None):
+        super().__init__(parent)
+        self._pending = dict()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+        # Counters
+        self.scheduled = 0
+        self.applied = 0
+        self.coalesced = 0
+
+    @property
+    def interval(self):
+        return self._timer.interval()
+
+    @interval.setter
+    def interval(self, interval):
+        self._timer.setInterval(interval)
+
+    def attach(self, *ports):
+        """Make the controllers of the given :class:`RxPort` use this scheduler."""
+        for port in ports:
+            port.controller.scheduler = self
+
+    def detach(self, *ports):
+        """Make the controllers of the given :class:`RxPort` update immediately."""
+        for port in ports:
+            self.flush_observer(port.controller)
+            port.controller.scheduler = None
+
+    def schedule(self, observer, value):
+        """Queue a value for the observer, replacing any value still pending."""
+        self.scheduled += 1
+        if observer in self._pending:
+            self.coalesced += 1
+            observer.coalesced += 1
+        self._pending[observer] = value
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush_observer(self, observer):
+        """Apply the value pending for a single observer, if any."""
+        if observer in self._pending:
+            self.applied += 1
+            observer.apply(self._pending.pop(observer))
+
+    def flush(self):
+        """Apply all pending values now."""
+        self._timer.stop()
+        pending = self._pending
+        self._pending = dict()
+        for observer, value in pending.items():
+            self.applied += 1
+            observer.apply(value)
+
+    def stats(self):
+        """Returns the counters as a dict."""
+        return {'scheduled': self.scheduled,
+                'applied': self.applied,
+                'coalesced': self.coalesced,
+                'pending': len(self._pending)}
+
+
+class InputPolicy(QObject):
+    """Decides when the values sent by a widget are emitted.
+
+    Policies are set on the stream of a port, with
+    :meth:`reaqt.common.RxPort.set_policy`, and hold back
+    the values of the widget using a Qt timer.
+
+    .. code-block:
+
+        search.rx.text.set_policy(Debounce(300))
+    """
+
+    def __init__(self, interval=0, parent=None):
+        super().__init__(parent)
+        # The function that emits the values; set by the stream
+        self.target = None
+        self._pending = Nothing
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._timeout)
+        # Counters
+        self.received = 0
+        self.emitted = 0
+
+    @property
+    def interval(self):
+        return self._timer.interval()
+
+    @interval.setter
+    def interval(self, interval):
+        self._timer.setInterval(interval)
+
+    @property
+    def pending(self):
+        """True if a value is being held back."""
+        return self._pending is not Nothing
+
+    def push(self, value):
+        raise NotImplementedError()
+
+    def _timeout(self):
+        raise NotImplementedError()
+
+    def _emit(self, value):
+        self.emitted += 1
+        self.target(value)
+
+    def _emit_pending(self):
+        value = self._pending
+        self._pending = Nothing
+        if value is not Nothing:
+            self._emit(value)
+            return True
+        return False
+
+    def flush(self):
+        """Emit the value being held back, if any, now."""
+        self._timer.stop()
+        self._emit_pending()
+
+    def cancel(self):
+        """Drop the value being held back, if any."""
+        self._timer.stop()
+        self._pending = Nothing
+
+
+class Debounce(InputPolicy):
+    """Emit a value once the widget has been quiet for ``interval`` milliseconds.
+
+    With ``trailing`` the last value of a burst is emitted at its end;
+    with ``leading`` the first one is emitted at its start.
+    """
+
+    def __init__(self, interval, leading=False, trailing=True, parent=None):
+        super().__init__(interval, parent)
+        self.leading = leading
+        self.trailing = trailing
+
+    def push(self, value):
+        self.received += 1
+        if self.leading and not self._timer.isActive():
+            self._pending = Nothing
+            self._emit(value)
+        else:
+            self._pending = value
+        self._timer.start()
+
+    def _timeout(self):
+        if self.trailing:
+            self._emit_pending()
+        else:
+            self._pending = Nothing
+
+
+class Throttle(InputPolicy):
+    """Emit at most one value every ``interval`` milliseconds.
+
+    With ``leading`` the first value is emitted at once; with ``trailing``
+    the last value held back is emitted at the end of the interval,
+    so the final value is never lost.
+    """
+
+    def __init__(self, interval, leading=True, trailing=True, parent=None):
+        super().__init__(interval, parent)
+        self.leading = leading
+        self.trailing = trailing
+
+    def push(self, value):
+        self.received += 1
+        if self._timer.isActive():
+            self._pending = value
+            return
+        if self.leading:
+            self._emit(value)
+        else:
+            self._pending = value
+        self._timer.start()
+
+    def _timeout(self):
+        if self.trailing and self._emit_pending():
+            # Keep the rate until the values stop coming
+            self._timer.start()
+        else:
+            self._pending = Nothing
+
+
+class SampleOnIdle(InputPolicy):
+    """Emit the latest value once Qt has handled the pending events.
+
+    A burst of input events (such as the mouse moves of a slider
+    being dragged) results in a single value, emitted when the
+    event loop becomes idle, or ``interval`` milliseconds later.
+    """
+
+    def push(self, value):
+        self.received += 1
+        self._pending = value
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _timeout(self):
+        self._emit_pending()
+
+
+class _Dispatcher(QObject):
+    """Runs functions on the thread the dispatcher lives in."""
+
+    invoke = Signal(object)
+
+    def __init__(self):
+        super().__init__()
+        self.invoke.connect(self._run, Qt.QueuedConnection)
+
+    @Slot(object)
+    def _run(self, func):
+        func()
+
+
+class QtMainThreadScheduler(SchedulerBase):
+    """An Rx scheduler that runs actions on the Qt main (GUI) thread.
+
+    Actions can be scheduled from any thread. They are delivered through
+    a queued Qt event, so they always run from the Qt event loop.
+    Use it with ``observable.observe_on(...)`` so that values coming
+    from worker threads reach the widgets on the GUI thread.
+    """
+
+    def __init__(self):
+        self._dispatcher = _Dispatcher()
+        app = QCoreApplication.instance()
+        if app is not None:
+            self._dispatcher.moveToThread(app.thread())
+
+    def post(self, func):
+        """Run ``func()`` on the main thread, from the event loop."""
+        self._dispatcher.invoke.emit(func)
+
+    def schedule(self, action, state=None):
+        """Schedules an action to be executed on the main thread."""
+        cancelled = BooleanDisposable()
+        disposable = SingleAssignmentDisposable()
+
+        def run():
+            if not cancelled.is_disposed:
+                disposable.disposable = action(self, state)
+
+        self.post(run)
+        return CompositeDisposable(cancelled, disposable)
+
+    def schedule_relative(self, duetime, action, state=None):
+        """Schedules an action to be executed on the main thread after duetime."""
+        msecs = self.to_relative(duetime)
+        if msecs <= 0:
+            return self.schedule(action, state)
+
+        cancelled = BooleanDisposable()
+        disposable = SingleAssignmentDisposable()
+
+        def run():
+            if not cancelled.is_disposed:
+                disposable.disposable = action(self, state)
+
+        # The timer must be started from the thread it belongs to
+        self.post(lambda: QTimer.singleShot(msecs, run))
+        return CompositeDisposable(cancelled, disposable)
+
+    def schedule_absolute(self, duetime, action, state=None):
+        """Schedules an action to be executed on the main thread at duetime."""
+        duetime = self.to_datetime(duetime)
+        return self.schedule_relative(duetime - self.now, action, state)
+
+
+_main_thread_scheduler = None
+_thread_pool_scheduler = None
+_process_pool_executor = None
+_lock = threading.Lock()
+
+def main_thread_scheduler():
+    """Returns the shared :class:`QtMainThreadScheduler`.
+
+    It must be first called after the ``QApplication`` has been created.
+    """
+    global _main_thread_scheduler
+    with _lock:
+        if _main_thread_scheduler is None:
+            _main_thread_scheduler = QtMainThreadScheduler()
+        return _main_thread_scheduler
+
+def thread_pool_scheduler(max_workers=None):
+    """Returns a shared Rx scheduler backed by a thread pool.
+
+    ``max_workers`` is only used the first time this is called.
+    """
+    global _thread_pool_scheduler
+    with _lock:
+        if _thread_pool_scheduler is None:
+            _thread_pool_scheduler = ThreadPoolScheduler(max_workers)
+        return _thread_pool_scheduler
+
+def process_pool_executor(max_workers=None):
+    """Returns a shared ``ProcessPoolExecutor``.
+
+    ``max_workers`` is only used the first time this is called.
+    """
+    global _process_pool_executor
+    with _lock:
+        if _process_pool_executor is None:
+            _process_pool_executor = concurrent.futures.ProcessPoolExecutor(max_workers)
+        return _process_pool_executor
+
+def observe_on_main_thread(observable):
+    """Deliver the values of the observable on the Qt main thread.
+
+    This is the hop that must come last in a chain that runs
+    on worker threads, before subscribing widgets to it.
+    """
+    return observable.observe_on(main_thread_scheduler())
+
+def observe_on_thread_pool(observable, scheduler=None):
+    """Deliver the values of the observable on worker threads.
+
+    The operators chained after this one (such as ``map``) run in the pool.
+
+    .. code-block:
+
+        bmi = observe_on_main_thread(
+                observe_on_thread_pool(Observable.combine_latest(h, w, tuple))
+                .map(lambda hw: calc_bmi(*hw)))
+        bmi.subscribe(label.rx.text)
+    """
+    return observable.observe_on(scheduler or thread_pool_scheduler())
+
+def subscribe_on_thread_pool(observable, scheduler=None):
+    """Subscribe to the observable (and run its producer) on worker threads.
+
+    This is useful for cold observables that do blocking work
+    when subscribed, such as reading a file.
+    """
+    return observable.subscribe_on(scheduler or thread_pool_scheduler())
+
+def map_in_process(observable, func, executor=None):
+    """Compute ``func(value)`` in a worker process, keeping only the latest result.
+
+    Pure-Python computations that would block the GUI thread (and that
+    threads can't speed up, because of the GIL) run in ``executor``, by
+    default the shared :func:`process_pool_executor`. The results are
+    delivered on the Qt main thread.
+
+    At most one computation is in flight. Values that arrive meanwhile
+    replace each other, and only the latest one is computed next; the
+    result of a computation whose input is no longer the latest is
+    dropped, so a stale result never reaches the subscribers.
+    ``func`` and the values must be picklable, so ``func`` is usually
+    a function defined at the top level of a module.
+
+    .. code-block:
+
+        bmi = map_in_process(Observable.combine_latest(h, w, lambda *hw: hw), calc_bmi_hw)
+        bmi.subscribe(label.rx.text)
+    """
+
+    def subscribe(observer):
+        main_thread = main_thread_scheduler()
+        pool = executor or process_pool_executor()
+        # All the state is only used on the main thread
+        state = {'running': None, 'next': Nothing, 'completed': False, 'disposed': False}
+
+        def submit(value):
+            future = pool.submit(func, value)
+            state['running'] = future
+            # The callback runs on a thread of the executor
+            # (or right away, if the future is cancelled)
+            future.add_done_callback(lambda f: main_thread.post(lambda: done(f)))
+
+        def done(future):
+            state['running'] = None
+            if state['disposed']:
+                return
+            if state['next'] is not Nothing:
+                # A newer value arrived: drop this result and compute that one
+                value, state['next'] = state['next'], Nothing
+                submit(value)
+            else:
+                error = future.exception()
+                if error is not None:
+                    observer.on_error(error)
+                    return
+                observer.on_next(future.result())
+            if state['running'] is None and state['completed']:
+                observer.on_completed()
+
+        def on_next(value):
+            if state['running'] is None:
+                submit(value)
+            else:
+                # Cancels the running computation if it hasn't started yet
+                state['running'].cancel()
+                state['next'] = value
+
+        def on_completed():
+            state['completed'] = True
+            if state['running'] is None:
+                observer.on_completed()
+
+        def dispose():
+            state['disposed'] = True
+            state['next'] = Nothing
+            if state['running'] is not None:
+                state['running'].cancel()
+
+        subscription = observable.subscribe(on_next, observer.on_error, on_completed)
+        return CompositeDisposable(subscription, AnonymousDisposable(dispose))
+
+    return Observable.create(subscribe)
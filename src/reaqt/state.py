@@ -1,7 +1,12 @@
 from rx import Observable, Observer
 from rx.subjects import Subject, BehaviorSubject
-import copy
+from rx.subjects.innersubscription import InnerSubscription
+import collections
+import contextlib
 import enum
+import heapq
+import itertools
+import numbers
 import pprint
 
 class Nothing(object):
@@ -10,19 +15,86 @@ class Nothing(object):
     """
     pass
 
+def make_equality(equality):
+    """Turns the description of an equality test into a function of two values.
+
+    ``equality`` can be:
+
+    * ``None``: no equality test (every value is a change)
+    * ``'identity'``: values are equal if they are the same object
+    * ``'equal'``: values are equal if they compare equal with ``==``
+    * a number: numbers are equal if they differ by at most that tolerance
+      (other values are compared with ``==``)
+    * a function of two values that returns ``True`` if they are equal
+    """
+    if equality is None or callable(equality):
+        return equality
+    if equality == 'identity':
+        return lambda a, b: a is b
+    if equality == 'equal':
+        return lambda a, b: a == b
+    if isinstance(equality, numbers.Real):
+        def close(a, b):
+            if isinstance(a, numbers.Real) and isinstance(b, numbers.Real):
+                return abs(a - b) <= equality
+            return a == b
+        return close
+    raise ValueError("Unsupported equality: {!r}".format(equality))
+
+
+class ChangeGate(object):
+    """Lets through only the values that are different from the last one.
+
+    The number of values that were stopped is kept in ``suppressed``.
+    """
+
+    def __init__(self, equality, value=Nothing):
+        self.equal = make_equality(equality)
+        self.value = value
+        self.suppressed = 0
+
+    def admit(self, value):
+        """Returns ``True`` (and remembers the value) if the value is a change."""
+        if self.value is not Nothing and self.equal(self.value, value):
+            self.suppressed += 1
+            return False
+        self.value = value
+        return True
+
+
 class RxStream(Subject):
     """A reactive stream that remmebers the last accessed value
     
     Unlike BehaviorSubject, this is a cold observable.
+
+    If ``equality`` is given (see :func:`make_equality`), values equal
+    to the current one are not emitted.
     """
         
-    def __init__(self, value=Nothing):
+    def __init__(self, value=Nothing, equality=None):
         super().__init__()
         self.current_value = value 
+        self._parents = []
+        # Number of RxComputed values that depend on this stream
+        self._dependents = 0
+        self.gate = None if equality is None else ChangeGate(equality, value)
+
+    @property
+    def suppressed(self):
+        """The number of values that weren't emitted because they weren't changes."""
+        return 0 if self.gate is None else self.gate.suppressed
 
     def on_next(self, value):
-        super().on_next(value)
+        if self.gate is not None and not self.gate.admit(value):
+            return
         self.current_value = value
+        for parent in self._parents:
+            parent._changed()
+        if self._dependents:
+            with propagation():
+                super().on_next(value)
+        else:
+            super().on_next(value)
 
     def on_completed(self):
         pass
@@ -32,15 +104,35 @@ class RxBehaviorStream(BehaviorSubject):
     """A reactive stream that remmebers the last accessed value
     
     Like BehaviorSubject, this is a hot observable.
+
+    If ``equality`` is given (see :func:`make_equality`), values equal
+    to the current one are not emitted.
     """
         
-    def __init__(self, value):
+    def __init__(self, value, equality=None):
         super().__init__(value)
         self.current_value = value
+        self._parents = []
+        # Number of RxComputed values that depend on this stream
+        self._dependents = 0
+        self.gate = None if equality is None else ChangeGate(equality, value)
+
+    @property
+    def suppressed(self):
+        """The number of values that weren't emitted because they weren't changes."""
+        return 0 if self.gate is None else self.gate.suppressed
 
     def on_next(self, value):
-        super().on_next(value)
+        if self.gate is not None and not self.gate.admit(value):
+            return
         self.current_value = value
+        for parent in self._parents:
+            parent._changed()
+        if self._dependents:
+            with propagation():
+                super().on_next(value)
+        else:
+            super().on_next(value)
 
     def on_completed(self):
         pass
@@ -48,6 +140,108 @@ class RxBehaviorStream(BehaviorSubject):
 
 import enum
 
+# Computed values waiting to be recomputed, as a heap of (rank, serial, computed)
+_dirty = []
+_dirty_set = set()
+_serial = itertools.count()
+_propagation_depth = 0
+
+@contextlib.contextmanager
+def propagation():
+    """Group emissions, so that computed values are recomputed once, at the end.
+
+    Emissions of streams with computed dependents are grouped automatically;
+    this is only needed to group the emissions of several streams.
+    """
+    global _propagation_depth
+    _propagation_depth += 1
+    try:
+        yield
+    finally:
+        _propagation_depth -= 1
+        if _propagation_depth == 0:
+            _recompute_dirty()
+
+def _recompute_dirty():
+    global _propagation_depth
+    # Emissions during recomputation only mark values as dirty
+    _propagation_depth += 1
+    try:
+        while _dirty:
+            _, _, computed = heapq.heappop(_dirty)
+            _dirty_set.discard(computed)
+            computed._recompute()
+    finally:
+        _propagation_depth -= 1
+
+def _mark_dirty(computed):
+    if computed not in _dirty_set:
+        _dirty_set.add(computed)
+        heapq.heappush(_dirty, (computed.rank, next(_serial), computed))
+    if _propagation_depth == 0:
+        _recompute_dirty()
+
+
+class RxComputed(RxBehaviorStream):
+    """A value computed from other streams (including other computed values).
+
+    When the inputs change, the value is recomputed at most once,
+    after all the computed values it depends on have been recomputed
+    (in topological order), so it never emits intermediate values
+    computed from a mix of old and new inputs.
+
+    The inputs must be streams that remember their value
+    (such as the values of an :class:`RxMap`). Until all of them
+    have a value, the computed value is :class:`Nothing` and emits nothing.
+
+    .. code-block:
+
+        state = RxMap({'h': 172, 'w': 62})
+        state.add_items({'bmi': RxComputed(calc_bmi, state['h'], state['w'])})
+    """
+
+    def __init__(self, func, *inputs, equality=None):
+        self.func = func
+        self.inputs = inputs
+        self.rank = 1 + max([getattr(source, 'rank', 0) for source in inputs] or [0])
+        # Number of times the function has been called
+        self.evaluations = 0
+        self._subscribed = False
+        super().__init__(self._compute(), equality)
+        for source in inputs:
+            if hasattr(source, '_dependents'):
+                source._dependents += 1
+            source.subscribe(self._input_changed)
+        self._subscribed = True
+
+    def _compute(self):
+        values = [source.current_value for source in self.inputs]
+        if any(value is Nothing for value in values):
+            return Nothing
+        self.evaluations += 1
+        return self.func(*values)
+
+    def _input_changed(self, _):
+        # Streams emit their current value when subscribed to
+        if self._subscribed:
+            _mark_dirty(self)
+
+    def _recompute(self):
+        value = self._compute()
+        if value is not Nothing:
+            RxBehaviorStream.on_next(self, value)
+
+    def _subscribe_core(self, observer):
+        if self.current_value is Nothing:
+            with self.lock:
+                self.observers.append(observer)
+            return InnerSubscription(self, observer)
+        return super()._subscribe_core(observer)
+
+    def on_next(self, value):
+        raise TypeError("Computed values can't be set")
+
+
 class RxListEvent(enum.Enum):
     append = 0
     extend = 1
@@ -62,6 +256,139 @@ class RxListEvent(enum.Enum):
     reverse = 7
     copy = 8
     delitem = 9
+    # A list of events, emitted at the end of a batch
+    batch = 10
+    # A RxListChange
+    splice = 11
+
+
+class RxListChange(collections.namedtuple('RxListChange', ['start', 'removed', 'inserted'])):
+    """A change to a list: ``removed`` items were replaced by the ``inserted``
+    items, starting at position ``start``.
+
+    Any edit to a list can be described by one or more of these records.
+    """
+
+    __slots__ = ()
+
+    @property
+    def delta(self):
+        """The change in length caused by this change."""
+        return len(self.inserted) - self.removed
+
+    def apply(self, items):
+        """Apply the change to a plain list, in place."""
+        items[self.start:self.start + self.removed] = self.inserted
+
+
+def compact_events(events):
+    """Compact a sequence of :class:`RxListEvent` into an equivalent shorter one.
+
+    Everything before a ``clear`` is dropped, runs of ``append`` and ``extend``
+    are merged into a single ``extend``, and of a run of ``sort`` and ``reverse``
+    only the last is kept.
+    """
+    for position in range(len(events) - 1, -1, -1):
+        if events[position][0] == RxListEvent.clear:
+            events = events[position:]
+            break
+
+    compacted = []
+    # The items of the current run of appends and extends
+    run = None
+    for typ, value in events:
+        if typ == RxListEvent.append or typ == RxListEvent.extend:
+            if run is None:
+                run = []
+                compacted.append((RxListEvent.extend, run))
+            if typ == RxListEvent.append:
+                run.append(value)
+            else:
+                run.extend(value)
+            continue
+
+        run = None
+        if typ in (RxListEvent.sort, RxListEvent.reverse) and compacted and \
+                compacted[-1][0] in (RxListEvent.sort, RxListEvent.reverse):
+            compacted[-1] = (typ, value)
+        else:
+            compacted.append((typ, value))
+    return compacted
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError("{} is immutable".format(type(self).__name__))
+
+
+class FrozenList(list):
+    """An immutable snapshot of a :class:`RxList`.
+
+    It is a real ``list``, so it can be serialized as one,
+    but all methods that would modify it raise ``TypeError``.
+    """
+
+    def __init__(self, items=(), version=0):
+        super().__init__(items)
+        self.version = version
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __reduce__(self):
+        return (FrozenList, (list(self), self.version))
+
+
+class FrozenDict(dict):
+    """An immutable snapshot of a :class:`RxMap`.
+
+    It is a real ``dict``, so it can be serialized as one,
+    but all methods that would modify it raise ``TypeError``.
+    """
+
+    def __init__(self, items=(), version=0):
+        super().__init__(items)
+        self.version = version
+
+    pop = popitem = clear = update = setdefault = _read_only
+    __setitem__ = __delitem__ = __ior__ = _read_only
+
+    def __copy__(self):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self), self.version))
+
+
+def changed_paths(old, new, path=()):
+    """Yields the paths (as tuples of keys) at which two snapshots differ.
+
+    Subtrees that were shared between the snapshots are skipped
+    without being traversed, so comparing two snapshots costs
+    in proportion to the changes between them.
+    """
+    if old is new:
+        return
+    if isinstance(old, FrozenDict) and isinstance(new, FrozenDict):
+        for key in new:
+            if key in old:
+                yield from changed_paths(old[key], new[key], path + (key,))
+            else:
+                yield path + (key,)
+        for key in old:
+            if key not in new:
+                yield path + (key,)
+    else:
+        try:
+            different = bool(old != new)
+        except ValueError:
+            # NumPy arrays compare element-wise; snapshots that
+            # aren't the same object are from different versions
+            different = True
+        if different:
+            yield path
 
 
 class RxContainer(object):
@@ -69,25 +396,81 @@ class RxContainer(object):
 
     Members must implement the `freeze()` method to make it easier to extract and
     serialize the values.
+
+    Snapshots are cached and versioned: calling `freeze()` again without any
+    change returns the same object, and the snapshot of a parent container
+    shares the snapshots of the children that haven't changed.
     """
 
+    _batch_depth = 0
+    _version = 0
+    _frozen = None
+    _parents = ()
+
+    @property
+    def version(self):
+        """A number that increases each time the container (or a child) changes."""
+        return self._version
+
     def freeze(self):
         raise NotImplemented()
 
+    def _changed(self):
+        # Drop the cached snapshot, here and in all the containers above
+        self._version += 1
+        self._frozen = None
+        for parent in self._parents:
+            parent._changed()
+
     def debug(self):
         pprint.pprint(self.freeze())
 
+    @contextlib.contextmanager
+    def batch(self):
+        """Buffer the changes made inside the block and emit them on exit.
+
+        Batches can be nested; only the outermost one emits.
+
+        .. code-block:
+
+            with state.batch():
+                for row in rows:
+                    state.append(row)
+        """
+        self._begin_batch()
+        try:
+            yield self
+        finally:
+            self._end_batch()
+
+    def _begin_batch(self):
+        self._batch_depth += 1
+
+    def _end_batch(self):
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self._flush()
+
+    def _flush(self):
+        pass
+
 
 
 class RxList(RxContainer):
     """A reactive list, which has been instrumented to emit values
     that can be captured by an :class:`RxPort`.
+
+    Inside a :meth:`RxContainer.batch` the events are buffered and emitted
+    on exit as a single ``(RxListEvent.batch, events)`` event, together
+    with a single update of the length.
     """
     
     def __init__(self, items):
         self._list = items
         self._stream = Subject()
         self.length = Subject()
+        self._pending = []
+        self._parents = []
 
     def __len__(self):
         return len(self._list)
@@ -95,10 +478,34 @@ class RxList(RxContainer):
     def broadcast_length(self):
         self.length.on_next(len(self._list))
 
+    def _emit(self, event):
+        self._changed()
+        if self._batch_depth > 0:
+            self._pending.append(event)
+        else:
+            self._stream.on_next(event)
+            self.length.on_next(len(self._list))
+
+    def _flush(self):
+        events = compact_events(self._pending)
+        self._pending = []
+        if not events:
+            return
+        if len(events) == 1:
+            self._stream.on_next(events[0])
+        else:
+            self._stream.on_next((RxListEvent.batch, events))
+        self.length.on_next(len(self._list))
+
+    def _snapshot(self):
+        # Inside a batch, later changes must not leak into earlier events
+        if self._batch_depth > 0:
+            return list(self._list)
+        return self._list
+
     def append(self, x, propagate=True):
         self._list.append(x)
-        self._stream.on_next((RxListEvent.append, x))
-        self.length.on_next(len(self._list))
+        self._emit((RxListEvent.append, x))
 
     def pop(self, i=-1):
         if i < 0:
@@ -106,86 +513,415 @@ class RxList(RxContainer):
         else:
             index = i
         self._list.pop(index)
-        self._stream.on_next((RxListEvent.pop, index))
-        self.length.on_next(len(self._list))
+        self._emit((RxListEvent.pop, index))
 
     def extend(self, L):
+        # The event needs the items, even if L is a one-shot iterator
+        L = list(L)
         self._list.extend(L)
-        self._stream.on_next((RxListEvent.extend, L))
-        self.length.on_next(len(self._list))
+        self._emit((RxListEvent.extend, L))
 
     def insert(self, i, x):
+        # Normalize the index in the same way as list.insert()
+        if i < 0:
+            i = max(0, i + len(self._list))
+        else:
+            i = min(i, len(self._list))
         self._list.insert(i, x)
-        self._stream.on_next((RxListEvent.insert, (i, (x, self._list[i+1:]))))
-        self.length.on_next(len(self._list))
+        self._emit((RxListEvent.insert, (i, x)))
 
     def clear(self):
         self._list.clear()
-        self._stream.on_next((RxListEvent.clear, None))
-        self.length.on_next(len(self._list))
+        self._emit((RxListEvent.clear, None))
 
     def reverse(self):
         self._list.reverse()
-        self._stream.on_next((RxListEvent.reverse, self._list))
-        self.length.on_next(len(self._list))
+        self._emit((RxListEvent.reverse, self._snapshot()))
 
     def sort(self, key=None, reverse=False):
         self._list.sort(key=key, reverse=reverse)
-        self._stream.on_next((RxListEvent.sort, self._list))
-        self.length.on_next(len(self._list))
+        self._emit((RxListEvent.sort, self._snapshot()))
 
     def splice(self, i, j, new):
-        raise NotImplemented()
+        """Replace the items in positions ``i:j`` by the items in ``new``."""
+        i, j, _ = slice(i, j).indices(len(self._list))
+        j = max(i, j)
+        new = list(new)
+        self._list[i:j] = new
+        self._emit((RxListEvent.splice, RxListChange(i, j - i, new)))
 
     def __iter__(self):
-        return seld._list
+        return iter(self._list)
 
     def __getitem__(self, arg):
         return self._list[arg]
 
     def __delitem__(self, arg):
-        del self._list[arg]
-        self._stream.on_next((RxListEvent.delitem, arg))
-        self.length.on_next(len(self._list))
+        if isinstance(arg, slice):
+            self._set_slice(arg, None)
+        else:
+            index = range(len(self._list))[arg]
+            del self._list[index]
+            self._emit((RxListEvent.delitem, index))
 
     def __setitem__(self, key, value):
-        raise Exception("Can't set RxList items.")
+        if isinstance(key, slice):
+            self._set_slice(key, list(value))
+        else:
+            index = range(len(self._list))[key]
+            self.splice(index, index + 1, [value])
+
+    def _set_slice(self, key, values):
+        # If values is None, the items are deleted
+        start, stop, step = key.indices(len(self._list))
+        if step == 1:
+            self.splice(start, stop, values or [])
+            return
+        # Extended slices become one change per position, applied from
+        # the end so that the positions of the earlier ones don't shift
+        indices = range(start, stop, step)
+        if values is not None and len(values) != len(indices):
+            raise ValueError("attempt to assign sequence of size {} "
+                             "to extended slice of size {}".format(len(values), len(indices)))
+        with self.batch():
+            for position in sorted(range(len(indices)), key=lambda k: indices[k], reverse=True):
+                index = indices[position]
+                inserted = [] if values is None else [values[position]]
+                self._list[index:index + 1] = inserted
+                self._emit((RxListEvent.splice, RxListChange(index, 1, inserted)))
 
     def freeze(self):
-        return copy.copy(self._list)
+        if self._frozen is None:
+            self._frozen = FrozenList(self._list, self._version)
+        return self._frozen
 
 
 class RxMap(RxContainer):
     """A reactive mutable map, which has been instrumented to emit values
     that can be captured by an :class:`RxPort`.
+
+    Inside a :meth:`RxContainer.batch` only the last value set for each key
+    is emitted, on exit. Nested containers are batched together with the map.
+
+    If ``equality`` is given (see :func:`make_equality`), setting a key
+    to a value equal to the current one doesn't emit anything.
     """
 
-    def __init__(self, d):
+    def __init__(self, d, equality=None):
+        self.equality = equality
         self._streams = dict()
+        self._pending = dict()
+        self._parents = []
         self.add_items(d)
 
     def __getitem__(self, key):
         return self._streams[key]
 
     def __setitem__(self, key, value):
-        self._streams[key].on_next(value)
+        if value is self._streams[key]:
+            # An in-place operator, like ``state['samples'] += 1``
+            return
+        if self._batch_depth > 0:
+            self._pending[key] = value
+        else:
+            self._streams[key].on_next(value)
+
+    def _begin_batch(self):
+        super()._begin_batch()
+        for value in self._streams.values():
+            if isinstance(value, RxContainer):
+                value._begin_batch()
+
+    def _end_batch(self):
+        for value in self._streams.values():
+            if isinstance(value, RxContainer):
+                value._end_batch()
+        super()._end_batch()
+
+    def _flush(self):
+        pending = self._pending
+        self._pending = dict()
+        # Computed values depending on several keys are only recomputed once
+        with propagation():
+            for key, value in pending.items():
+                self._streams[key].on_next(value)
 
     def add_items(self, d):
         for key, value in d.items():
             if isinstance(value, RxContainer):
                 self._streams[key] = value
+                # Keep the new container in the same batch as its parent
+                for _ in range(self._batch_depth):
+                    value._begin_batch()
+            elif isinstance(value, (RxStream, RxBehaviorStream)):
+                self._streams[key] = value
             else:
                 if value is Nothing:
-                    self._streams[key] = RxStream(value)
+                    self._streams[key] = RxStream(value, self.equality)
                 else:
-                    self._streams[key] = RxBehaviorStream(value)
+                    self._streams[key] = RxBehaviorStream(value, self.equality)
+            self._streams[key]._parents.append(self)
+        self._changed()
 
     def freeze(self):
-        d = dict()
-        for key, value in self._streams.items():
-            if isinstance(value, RxContainer):
-                d[key] = value.freeze()
+        if self._frozen is None:
+            d = dict()
+            for key, value in self._streams.items():
+                if isinstance(value, RxContainer):
+                    d[key] = value.freeze()
+                else:
+                    d[key] = value.current_value
+            self._frozen = FrozenDict(d, self._version)
+
+        return self._frozen
+
+
+class RxTableEvent(enum.Enum):
+    # The value is (row, column)
+    cell = 0
+    # The value is the row
+    row = 1
+    # The value is a RxTableRange
+    range = 2
+    # The value is (start, rows)
+    insert = 3
+    # The value is (start, count)
+    remove = 4
+    clear = 5
+    # A list of events, emitted at the end of a batch
+    batch = 6
+
+
+class RxTableRange(collections.namedtuple('RxTableRange', ['top', 'left', 'bottom', 'right'])):
+    """The cells in rows ``top:bottom`` and columns ``left:right`` of a table."""
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return self.bottom > self.top and self.right > self.left
+
+
+def merge_ranges(ranges, limit=64):
+    """Merge :class:`RxTableRange` objects into fewer ranges covering the same cells.
+
+    Overlapping or adjacent ranges spanning the same columns (or the same rows)
+    are joined and ranges inside another one are dropped. If more than ``limit``
+    ranges remain, they are replaced by their bounding range.
+    """
+    ranges = [r for r in ranges if r]
+    while True:
+        count = len(ranges)
+        ranges = _merge_runs(ranges, 0)
+        ranges = _merge_runs(ranges, 1)
+        if len(ranges) == count:
+            break
+
+    if len(ranges) > limit:
+        return [RxTableRange(min(r.top for r in ranges), min(r.left for r in ranges),
+                             max(r.bottom for r in ranges), max(r.right for r in ranges))]
+
+    def inside(inner, outer):
+        return outer.top <= inner.top and inner.bottom <= outer.bottom and \
+            outer.left <= inner.left and inner.right <= outer.right
+
+    return [r for i, r in enumerate(ranges)
+            if not any(j != i and inside(r, other) for j, other in enumerate(ranges))]
+
+
+def _merge_runs(ranges, axis):
+    # Join the ranges that have the same extent on the other axis
+    # and overlap or touch on this one
+    if axis == 0:
+        fixed = lambda r: (r.left, r.right)
+        span = lambda r: (r.top, r.bottom)
+        make = lambda f, s: RxTableRange(s[0], f[0], s[1], f[1])
+    else:
+        fixed = lambda r: (r.top, r.bottom)
+        span = lambda r: (r.left, r.right)
+        make = lambda f, s: RxTableRange(f[0], s[0], f[1], s[1])
+
+    merged = []
+    last_fixed = last_span = None
+    for r in sorted(ranges, key=lambda r: (fixed(r), span(r))):
+        f, (start, stop) = fixed(r), span(r)
+        if f == last_fixed and start <= last_span[1]:
+            last_span = (last_span[0], max(last_span[1], stop))
+            merged[-1] = make(f, last_span)
+        else:
+            last_fixed, last_span = f, (start, stop)
+            merged.append(r)
+    return merged
+
+
+class RxTable(RxContainer):
+    """A reactive table, with a fixed list of (optionally typed) columns.
+
+    ``columns`` is a list of column names or of ``(name, type)`` pairs.
+    Values written to a typed column are converted to its type
+    (``None`` is kept as it is).
+
+    Cells are read with ``table[row, column]`` and rows with ``table[row]``,
+    where ``column`` is a name or a position. Writing a cell, a row or
+    a rectangle of cells emits a single :class:`RxTableEvent`.
+    Inside a :meth:`RxContainer.batch` the events are buffered and
+    emitted on exit as a single ``(RxTableEvent.batch, events)``.
+    """
+
+    def __init__(self, columns, rows=()):
+        self.columns = []
+        self.types = []
+        for column in columns:
+            if isinstance(column, tuple):
+                name, typ = column
             else:
-                d[key] = value.current_value
+                name, typ = column, None
+            self.columns.append(name)
+            self.types.append(typ)
+        self._column_index = {name: i for i, name in enumerate(self.columns)}
+        self._rows = [self._convert_row(row) for row in rows]
+        self._stream = Subject()
+        self.length = Subject()
+        self._pending = []
+        self._parents = []
+
+    def __len__(self):
+        return len(self._rows)
 
-        return d
+    def __iter__(self):
+        return (tuple(row) for row in self._rows)
+
+    def broadcast_length(self):
+        self.length.on_next(len(self._rows))
+
+    def column(self, column):
+        """Returns the position of a column, given by name or position."""
+        if isinstance(column, numbers.Integral):
+            return range(len(self.columns))[column]
+        return self._column_index[column]
+
+    def _row(self, row):
+        return range(len(self._rows))[row]
+
+    def _convert(self, column, value):
+        typ = self.types[column]
+        if typ is None or value is None or isinstance(value, typ):
+            return value
+        return typ(value)
+
+    def _convert_row(self, values):
+        if isinstance(values, dict):
+            values = [values.get(name) for name in self.columns]
+        values = list(values)
+        if len(values) != len(self.columns):
+            raise ValueError("expected {} values, got {}".format(len(self.columns), len(values)))
+        return [self._convert(column, value) for column, value in enumerate(values)]
+
+    def _emit(self, event):
+        self._changed()
+        if self._batch_depth > 0:
+            self._pending.append(event)
+        else:
+            self._stream.on_next(event)
+            if event[0] in (RxTableEvent.insert, RxTableEvent.remove, RxTableEvent.clear):
+                self.length.on_next(len(self._rows))
+
+    def _flush(self):
+        events = self._pending
+        self._pending = []
+        for position in range(len(events) - 1, -1, -1):
+            if events[position][0] == RxTableEvent.clear:
+                events = events[position:]
+                break
+        if not events:
+            return
+        if len(events) == 1:
+            self._stream.on_next(events[0])
+        else:
+            self._stream.on_next((RxTableEvent.batch, events))
+        self.length.on_next(len(self._rows))
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            row, column = key
+            return self._rows[row][self.column(column)]
+        return tuple(self._rows[key])
+
+    def __setitem__(self, key, value):
+        if isinstance(key, tuple):
+            row, column = key
+            row = self._row(row)
+            column = self.column(column)
+            self._rows[row][column] = self._convert(column, value)
+            self._emit((RxTableEvent.cell, (row, column)))
+        else:
+            self.set_row(key, value)
+
+    def set_row(self, row, values):
+        """Replace all the values in a row."""
+        row = self._row(row)
+        # In place, so that the row is shared with any model showing it
+        self._rows[row][:] = self._convert_row(values)
+        self._emit((RxTableEvent.row, row))
+
+    def set_range(self, top, left, values):
+        """Write a rectangle of values (a list of rows) with its top left cell at ``(top, left)``."""
+        values = [list(row) for row in values]
+        if not values:
+            return
+        top = self._row(top)
+        left = self.column(left)
+        width = max((len(row) for row in values), default=0)
+        if top + len(values) > len(self._rows) or left + width > len(self.columns):
+            raise IndexError("range out of the table")
+        for row, row_values in zip(self._rows[top:top + len(values)], values):
+            for column, value in enumerate(row_values, left):
+                row[column] = self._convert(column, value)
+        change = RxTableRange(top, left, top + len(values), left + width)
+        if change:
+            self._emit((RxTableEvent.range, change))
+
+    def set_column(self, column, values, start=0):
+        """Write the values of a column, starting at row ``start``."""
+        column = self.column(column)
+        values = list(values)
+        if not values:
+            return
+        start = self._row(start)
+        if start + len(values) > len(self._rows):
+            raise IndexError("range out of the table")
+        typ = self.types[column]
+        for row, value in zip(self._rows[start:start + len(values)], values):
+            if typ is not None and value is not None and not isinstance(value, typ):
+                value = typ(value)
+            row[column] = value
+        self._emit((RxTableEvent.range, RxTableRange(start, column, start + len(values), column + 1)))
+
+    def append_rows(self, rows):
+        self.insert_rows(len(self._rows), rows)
+
+    def insert_rows(self, i, rows):
+        if i < 0:
+            i = max(0, i + len(self._rows))
+        else:
+            i = min(i, len(self._rows))
+        rows = [self._convert_row(row) for row in rows]
+        if rows:
+            self._rows[i:i] = rows
+            self._emit((RxTableEvent.insert, (i, rows)))
+
+    def remove_rows(self, i, count=1):
+        if i < 0:
+            i = max(0, i + len(self._rows))
+        i, j, _ = slice(i, i + count).indices(len(self._rows))
+        if j > i:
+            del self._rows[i:j]
+            self._emit((RxTableEvent.remove, (i, j - i)))
+
+    def clear(self):
+        self._rows.clear()
+        self._emit((RxTableEvent.clear, None))
+
+    def freeze(self):
+        if self._frozen is None:
+            self._frozen = FrozenList((FrozenList(row) for row in self._rows), self._version)
+        return self._frozen
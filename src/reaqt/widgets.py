@@ -1,4 +1,8 @@
+import bisect
+import collections
+import contextlib
 import datetime
+import time
 
 from qtpy.QtCore import *
 from qtpy.QtGui import *
@@ -9,6 +13,7 @@ from rx.subjects import Subject, BehaviorSubject
 from .utils import conversions
 from .utils.misc import scale
 from .common import FakeObservable, RxPort, RxPortManager, RxObserver, RxObservable
+from .models import IncrementalFilterModel, RxListModel
 from .state import RxListEvent
 
 from collections import namedtuple
@@ -22,8 +27,8 @@ class RxPushButton(QPushButton):
         super(QPushButton, self).__init__(*args, **kwargs)
         self.rx = RxPortManager()
         # Button signals
-        self.rx.clicked  = RxPort(RxObserver(self, self.click()),
-                                  RxObservable(self.clicked,  get=lambda: True))
+        self.rx.define('clicked', lambda: RxPort(RxObserver(self, lambda _: self.click()),
+                                                 RxObservable(self.clicked, get=lambda: True)))
         #self.rx.released = RxPort(RxObserver(self, self.release()), RxObservable(self.released, get=lambda: True))
         #self.rx.pressed  = RxPort(RxObserver(self, self.press()),   RxObservable(self.pressed,  get=lambda: True))
 
@@ -41,18 +46,17 @@ class RxSlider(QSlider):
         if minimum is not None:
             self.setMinimum(minimum)
         else:
-            self.rx.minimum = RxPort(RxObserver(self, self.setMinimum, insert),
-                                   FakeObservable())
+            self.rx.define('minimum', lambda: RxPort(RxObserver(self, self.setMinimum, insert),
+                                                     FakeObservable()))
         # Maximum
         if maximum is not None:
             self.setMaximum(insert(maximum))
         else:
-            self.rx.maximum = RxPort(RxObserver(self, self.setMaximum, insert),
-                                   FakeObservable())
+            self.rx.define('maximum', lambda: RxPort(RxObserver(self, self.setMaximum, insert),
+                                                     FakeObservable()))
         # Value
-        controller = RxObserver(self, self.setValue, insert)
-        stream = RxObservable(self.valueChanged, extract)
-        self.rx.value = RxPort(controller, stream)
+        self.rx.define('value', lambda: RxPort(RxObserver(self, self.setValue, insert),
+                                               RxObservable(self.valueChanged, extract)))
 
 class RxCheckBox(QCheckBox):
     """Reactive QCheckBox"""
@@ -61,13 +65,12 @@ class RxCheckBox(QCheckBox):
         super(RxCheckBox, self).__init__(parent)
         self.rx = RxPortManager()
         # Checked Value
-        controller = RxObserver(self, self.setChecked)
-        stream = RxObservable(self.stateChanged)
-        self.rx.checked = RxPort(controller, stream)
+        self.rx.define('checked', lambda: RxPort(RxObserver(self, self.setChecked),
+                                                 RxObservable(self.stateChanged)))
         # Text
         if text is None:
-            self.rx.text = RxPort(RxObserver(self, self.setText),
-                                FakeObservable())
+            self.rx.define('text', lambda: RxPort(RxObserver(self, self.setText),
+                                                  FakeObservable()))
         else:
             self.setText(text)
 
@@ -78,13 +81,12 @@ class RxRadioButton(QRadioButton):
         super(RxRadioButton, self).__init__(parent)
         self.rx = RxPortManager()
         # Checked Value
-        controller = RxObserver(self, self.setChecked)
-        stream = RxObservable(self.toggled)
-        self.rx.checked = RxPort(controller, stream)
+        self.rx.define('checked', lambda: RxPort(RxObserver(self, self.setChecked),
+                                                 RxObservable(self.toggled)))
         # Text
         if text is None:
-            self.rx.text = RxPort(RxObserver(self, self.setText),
-                                  FakeObservable())
+            self.rx.define('text', lambda: RxPort(RxObserver(self, self.setText),
+                                                  FakeObservable()))
         else:
             self.setText(text)
 
@@ -96,8 +98,8 @@ class RxLabel(QLabel):
     def __init__(self, insert=str, **kwargs):
         super().__init__(**kwargs)
         self.rx = RxPortManager()
-        self.rx.text = RxPort(RxObserver(self, self.setText, insert),
-                              FakeObservable())
+        self.rx.define('text', lambda: RxPort(RxObserver(self, self.setText, insert),
+                                              FakeObservable()))
 
 
 class RxLineEdit(QLineEdit):
@@ -106,15 +108,17 @@ class RxLineEdit(QLineEdit):
     def __init__(self, realtime=True, **kwargs):
         super().__init__(**kwargs)
         self.rx = RxPortManager()
-        controller = RxObserver(self, self.setText)
 
-        if realtime:
-            stream = RxObservable(self.textEdited)
-        else:
-            stream = RxObservable(self.editingFinished,
-                                  get=self.text)
+        def text_port():
+            controller = RxObserver(self, self.setText)
+            if realtime:
+                stream = RxObservable(self.textEdited)
+            else:
+                stream = RxObservable(self.editingFinished,
+                                      get=self.text)
+            return RxPort(controller, stream)
 
-        self.rx.text = RxPort(controller, stream)
+        self.rx.define('text', text_port)
 
 
 class RxSpinBox(QSpinBox):
@@ -123,16 +127,14 @@ class RxSpinBox(QSpinBox):
     def __init__(self, **kwargs):
         super(QSpinBox, self).__init__(**kwargs)
         self.rx = RxPortManager()
-        controller = RxObserver(self, self.setValue)
-        stream = RxObservable(self.valueChanged)
-
-        self.rx.value = RxPort(controller, stream)
+        self.rx.define('value', lambda: RxPort(RxObserver(self, self.setValue),
+                                               RxObservable(self.valueChanged)))
         # Minimum
-        self.rx.minimum = RxPort(RxObserver(self, self.setMinimum),
-                                 FakeObservable())
+        self.rx.define('minimum', lambda: RxPort(RxObserver(self, self.setMinimum),
+                                                 FakeObservable()))
         # Maximum
-        self.rx.maximum = RxPort(RxObserver(self, self.setMaximum),
-                                 FakeObservable())
+        self.rx.define('maximum', lambda: RxPort(RxObserver(self, self.setMaximum),
+                                                 FakeObservable()))
 
 class RxCalendarWidget(QCalendarWidget):
     """Reactive QCalendarWidget"""
@@ -140,18 +142,17 @@ class RxCalendarWidget(QCalendarWidget):
     def __init__(self, **kwargs):
         super(QCalendarWidget, self).__init__(**kwargs)
         self.rx = RxPortManager()
-        controller = RxObserver(self, self.setSelectedDate, transform=conversions.date_to_QDate)
-        stream = RxObservable(self.selectionChanged, transform=conversions.QDate_to_date, get=self.selectedDate)
-
-        self.rx.date = RxPort(controller, stream)
+        self.rx.define('date', lambda: RxPort(
+            RxObserver(self, self.setSelectedDate, transform=conversions.date_to_QDate),
+            RxObservable(self.selectionChanged, transform=conversions.QDate_to_date, get=self.selectedDate)))
         # Minimum
-        controller = RxObserver(self, self.setMinimumDate, transform=conversions.date_to_QDate)
-        stream = FakeObservable()
-        self.rx.minimum = RxPort(controller, stream)
+        self.rx.define('minimum', lambda: RxPort(
+            RxObserver(self, self.setMinimumDate, transform=conversions.date_to_QDate),
+            FakeObservable()))
         # Maximum
-        controller = RxObserver(self, self.setMaximumDate, transform=conversions.date_to_QDate)
-        stream = FakeObservable()
-        self.rx.maximum = RxPort(controller, stream)
+        self.rx.define('maximum', lambda: RxPort(
+            RxObserver(self, self.setMaximumDate, transform=conversions.date_to_QDate),
+            FakeObservable()))
 
 
 
@@ -161,10 +162,9 @@ class RxDateEdit(QDateEdit):
     def __init__(self, **kwargs):
         super(QDateEdit, self).__init__(**kwargs)
         self.rx = RxPortManager()
-        controller = RxObserver(self, self.setDate, transform=conversions.date_to_QDate)
-        stream = RxObservable(self.dateChanged, transform=conversions.QDate_to_date)
-
-        self.rx.date = RxPort(controller, stream)
+        self.rx.define('date', lambda: RxPort(
+            RxObserver(self, self.setDate, transform=conversions.date_to_QDate),
+            RxObservable(self.dateChanged, transform=conversions.QDate_to_date)))
 
 class RxTimeEdit(QTimeEdit):
     """Reactive QTimeEdit"""
@@ -172,10 +172,9 @@ class RxTimeEdit(QTimeEdit):
     def __init__(self, **kwargs):
         super(QTimeEdit, self).__init__(**kwargs)
         self.rx = RxPortManager()
-        controller = RxObserver(self, self.setTime, transform=time_to_QTime)
-        stream = RxObservable(self.timeChanged, transform=QTime_to_time)
-
-        self.rx.date = RxPort(controller, stream)
+        self.rx.define('date', lambda: RxPort(
+            RxObserver(self, self.setTime, transform=conversions.time_to_QTime),
+            RxObservable(self.timeChanged, transform=conversions.QTime_to_time)))
 
 
 class RxDateTimeEdit(QDateTimeEdit):
@@ -184,10 +183,9 @@ class RxDateTimeEdit(QDateTimeEdit):
     def __init__(self, **kwargs):
         super(QDateTimeEdit, self).__init__(**kwargs)
         self.rx = RxPortManager()
-        controller = RxObserver(self, self.setDateTime, transform=conversions.datetime_to_QDateTime)
-        stream = RxObservable(self.dateTimeChanged, transform=conversions.QDateTime_to_datetime)
-
-        self.rx.date = RxPort(controller, stream)
+        self.rx.define('date', lambda: RxPort(
+            RxObserver(self, self.setDateTime, transform=conversions.datetime_to_QDateTime),
+            RxObservable(self.dateTimeChanged, transform=conversions.QDateTime_to_datetime)))
 
 
 
@@ -199,15 +197,51 @@ class RxWidget(QWidget):
         self.rx = RxPortManager()
 
 class RxConditional(QWidget):
-    pass
+    """Base class for widgets that display one of several branches.
+
+    Showing the branch that is already displayed does nothing.
+    If ``keep_alive`` is greater than 0, up to that many previously
+    displayed branch widgets are kept hidden (least recently used first out),
+    so that switching back to them doesn't rebuild them.
+    """
+
+    def _init_branches(self, keep_alive=0):
+        self.rx.keep_alive = keep_alive
+        self.rx.current_branch = None
+        self.rx.cache = collections.OrderedDict()
+
+    def _show_branch(self, branch, builder):
+        if branch == self.rx.current_branch:
+            return
+        layout = self.layout()
+        while layout.count() > 0:
+            child = layout.takeAt(0).widget()
+            if self.rx.keep_alive > 0 and self.rx.current_branch is not None:
+                child.hide()
+                self.rx.cache[self.rx.current_branch] = child
+            else:
+                child.setParent(None)
+
+        widget = self.rx.cache.pop(branch, None)
+        while len(self.rx.cache) > self.rx.keep_alive:
+            _, evicted = self.rx.cache.popitem(last=False)
+            evicted.setParent(None)
+        if widget is None:
+            widget = builder()
 
+        layout.addWidget(widget)
+        widget.show()
+        self.rx.current_branch = branch
+        self.adjustSize()
 
-class RxIf(QWidget):
+
+class RxIf(RxConditional):
     """Widget that displays it's contents depending on a condition"""
 
-    def __init__(self, observable, then, else_=None):
+    def __init__(self, observable, then, else_=None, keep_alive=0):
         super(QWidget, self).__init__()
         self.rx = RxPortManager()
+        self._init_branches(keep_alive)
         self.rx.observable = observable
         self.rx.then_builder = then
         self.rx.else_builder = else_
@@ -218,19 +252,20 @@ class RxIf(QWidget):
 
     def _conditionChanged(self, value):
         if value:
-            replace_children_by_widget(self, self.rx.then_builder())
+            self._show_branch('then', self.rx.then_builder)
         elif self.rx.else_builder:
-            replace_children_by_widget(self, self.rx.else_builder())
+            self._show_branch('else', self.rx.else_builder)
 
 def replace_children_by_widget(parent_widget, replacement_widget):
     clear_widget(parent_widget)
     parent_widget.layout().addWidget(replacement_widget)
     parent_widget.adjustSize()
 
-class RxWidgetBranchedWithDefault(QWidget):
-    def __init__(self, observable, branches, otherwise=None):
+class RxWidgetBranchedWithDefault(RxConditional):
+    def __init__(self, observable, branches, otherwise=None, keep_alive=0):
         super(QWidget, self).__init__()
         self.rx = RxPortManager()
+        self._init_branches(keep_alive)
         self.rx.observable = observable
         self.rx.branches = branches
         self.rx.otherwise = otherwise
@@ -245,42 +280,43 @@ class RxWidgetBranchedWithDefault(QWidget):
 class RxMatch(RxWidgetBranchedWithDefault):
 
     def _observableChanged(self, value):
-        for (predicate, builder) in self.rx.branches:
+        for branch, (predicate, builder) in enumerate(self.rx.branches):
             if predicate(value):
-                replace_children_by_widget(self, builder())
+                self._show_branch(branch, builder)
                 return
 
         if self.rx.otherwise:
-            replace_children_by_widget(self, self.rx.otherwise())
+            self._show_branch('otherwise', self.rx.otherwise)
 
 class RxCase(RxWidgetBranchedWithDefault):
 
     def _observableChanged(self, value):
-        for (comparator, builder) in self.rx.branches:
+        for branch, (comparator, builder) in enumerate(self.rx.branches):
             if value == comparator:
-                replace_children_by_widget(self, builder())
+                self._show_branch(branch, builder)
                 return
 
         if self.rx.otherwise:
-            replace_children_by_widget(self, self.rx.otherwise())
+            self._show_branch('otherwise', self.rx.otherwise)
 
-class RxCond(QWidget):
+class RxCond(RxConditional):
 
-    def __init__(self, branches):
+    def __init__(self, branches, keep_alive=0):
         super(QWidget, self).__init__()
         self.rx = RxPortManager()
+        self._init_branches(keep_alive)
         self.rx.branches = branches
         layout = QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(layout)
 
-        for (condition, builder) in self.rx.branches:
-            condition.subscribe(lambda x: self._react(x, builder))
+        for branch, (condition, builder) in enumerate(self.rx.branches):
+            condition.subscribe(lambda x, branch=branch, builder=builder:
+                                self._react(x, branch, builder))
 
-    def _react(self, x, builder):
+    def _react(self, x, branch, builder):
         if x:
-            print("Will replace.")
-            replace_children_by_widget(self, builder())
+            self._show_branch(branch, builder)
 
 
 class RxTabsWidget(QTabWidget):
@@ -290,31 +326,39 @@ class RxTabsWidget(QTabWidget):
         super(QTabWidget, self).__init__(*args, **kwargs)
 
         self.rx = RxPortManager()
-        controller = RxObserver(self, self.setCurrentIndex)
-        stream = RxObservable(self.currentChanged)
-        self.rx.current_index = RxPort(controller, stream)
+        self.rx.define('current_index', lambda: RxPort(RxObserver(self, self.setCurrentIndex),
+                                                       RxObservable(self.currentChanged)))
 
         for tab_args in tabs:
             self.addTab(*tab_args)
 
 class RxSimpleComboBox(QComboBox):
+    """Reactive QComboBox for short lists of strings.
+
+    The items are replaced as a whole; for long or changing lists
+    use :class:`RxComboBox`.
+    """
 
     def __reset_items(self, items):
         self.clear()
         self.rx._data = items
+        self.rx._rows = dict()
+        for row, item in enumerate(items):
+            self.rx._rows.setdefault(item, row)
         self.addItems(items)
-        if items:
+        # Nobody can be listening to a port that doesn't exist yet
+        if items and self.rx.is_created('value'):
             self.rx.value.stream.on_next(0)
 
     def set_options_and_value(self, opts, value):
         self.__reset_items(opts)
-        self.__set_item_text(index)
+        self.__set_item_text(value)
 
     def __index_to_value(self, index):
         return self.rx._data[index]
 
     def __index_from_value(self, text):
-        return self.rx._data.index(text)
+        return self.rx._rows[text]
 
     def __set_item_text(self, text):
         index = self.__index_from_value(text)
@@ -324,46 +368,209 @@ class RxSimpleComboBox(QComboBox):
         super(QWidget, self).__init__()
         self.rx = RxPortManager()
         self.rx._data = []
+        self.rx._rows = dict()
         # ComboBox items
-        controller = RxObserver(self, self.__reset_items)
-        stream = FakeObservable()
-        self.rx.items = RxPort(controller, stream)
+        self.rx.define('items', lambda: RxPort(RxObserver(self, self.__reset_items),
+                                               FakeObservable()))
         # ComboBox value
-        controller = RxObserver(self, self.__set_item_text)
-        stream = RxObservable(self.currentIndexChanged, self.__index_to_value)
-        self.rx.value = RxPort(controller, stream)
+        self.rx.define('value', lambda: RxPort(RxObserver(self, self.__set_item_text),
+                                               RxObservable(self.currentIndexChanged,
+                                                            self.__index_to_value)))
 
 
-class RxBox(QWidget):
+class RxComboBox(QComboBox):
+    """Reactive QComboBox showing the items of a :class:`RxList`.
 
-    def __init__(self, rx_list, item_class, tight=True, layout_class=QVBoxLayout):
+    The combo box is backed by a :class:`reaqt.models.RxListModel`, so
+    changes to the list only update the affected rows, and values are
+    found by a hash lookup (see :meth:`reaqt.models.RxListModel.row_of`).
+    The text shown for each item is given by ``display``.
+
+    The ``value`` port holds the selected item (``None`` if there is none).
+    The ``items`` port accepts a whole new list, which is compared with
+    the current one so that only the rows in between the common start
+    and end are replaced. The selected item stays selected if it is
+    still in the new list.
+
+    If ``filterable`` is true, the combo box is editable and offers
+    the items whose text contains what has been typed.
+    """
+
+    def __init__(self, rx_list, display=str, filterable=False, parent=None):
+        super().__init__(parent)
+        self.rx = RxPortManager()
+        self.rx.state = rx_list
+        # Don't measure every item to find the size of the combo box
+        self.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.setMinimumContentsLength(16)
+        view = QListView()
+        view.setUniformItemSizes(True)
+        self.setView(view)
+        self.rx.model = RxListModel(rx_list, display, parent=self)
+        self.setModel(self.rx.model)
+        self.setCurrentIndex(0 if len(rx_list) else -1)
+
+        self.rx.define('value', lambda: RxPort(RxObserver(self, self.set_value),
+                                               RxObservable(self.currentIndexChanged, self.value_at)))
+        self.rx.define('items', lambda: RxPort(RxObserver(self, self.set_items),
+                                               FakeObservable()))
+
+        if filterable:
+            self.setEditable(True)
+            self.setInsertPolicy(QComboBox.NoInsert)
+            self.rx.filter_model = IncrementalFilterModel(self.rx.model, parent=self)
+            completer = QCompleter(self)
+            completer.setModel(self.rx.filter_model)
+            completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+            self.setCompleter(completer)
+            self.lineEdit().textEdited.connect(self.rx.filter_model.set_filter)
+            completer.activated[QModelIndex].connect(self.__completion_activated)
+
+    def __completion_activated(self, index):
+        index = self.completer().completionModel().mapToSource(index)
+        self.setCurrentIndex(self.rx.filter_model.source_row(index.row()))
+
+    def value_at(self, row):
+        """Returns the item in the given row, or ``None`` for -1."""
+        if row < 0:
+            return None
+        return self.rx.model.item(row)
+
+    def value(self):
+        return self.value_at(self.currentIndex())
+
+    def set_value(self, value):
+        self.setCurrentIndex(self.rx.model.row_of(value))
+
+    def set_items(self, items):
+        """Replace the items, changing only the rows that differ."""
+        items = list(items)
+        old = self.rx.state._list
+        start = 0
+        common = min(len(old), len(items))
+        while start < common and old[start] == items[start]:
+            start += 1
+        old_stop, new_stop = len(old), len(items)
+        while old_stop > start and new_stop > start and old[old_stop - 1] == items[new_stop - 1]:
+            old_stop -= 1
+            new_stop -= 1
+        if old_stop == start and new_stop == start:
+            return
+        # Removing rows moves the current index around, and may remove
+        # the selected item: the selection is restored without signals,
+        # and the value is only emitted (once) if it was lost
+        selected = self.currentIndex() >= 0
+        value = self.value()
+        blocked = self.blockSignals(True)
+        try:
+            self.rx.state.splice(start, old_stop, items[start:new_stop])
+            row = self.rx.model.row_of(value) if selected else -1
+            if row >= 0:
+                self.setCurrentIndex(row)
+        finally:
+            self.blockSignals(blocked)
+        if row < 0 and (selected or self.currentIndex() >= 0):
+            # Even when called by the items port, whose controller blocks
+            # the signals: this is a change of the value, not an echo
+            blocked = self.blockSignals(False)
+            try:
+                self.currentIndexChanged.emit(self.currentIndex())
+            finally:
+                self.blockSignals(blocked)
+
+
+class RxBox(QWidget):
+    """Reactive Box, which renders an :class:`RxList` as one widget per item.
+
+    Item widgets are built by calling ``item_class(index, item)``.
+    If an item widget exposes an ``rx.index`` port (or any observer
+    under that name), the box will push the new index into it when
+    the item moves, instead of rebuilding the widget.
+
+    If ``key`` is given, it must be a function from an item to a hashable
+    value that identifies it. On ``sort`` and ``reverse`` the existing
+    widgets are then matched by key and moved inside the layout,
+    instead of the whole box being rebuilt.
+
+    If ``pool_size`` is given, up to that many removed item widgets
+    are kept hidden in a :class:`WidgetPool` and reused for new items,
+    if they implement ``rebind(index, item)``.
+
+    If ``frame_budget`` is given, the initial items and the items added
+    by ``extend`` are rendered in slices, spending at most that many
+    milliseconds per iteration of the event loop, so the window stays
+    responsive. ``rx.progress`` emits ``(rendered, total)`` after each
+    slice. Changes to the list made in the meantime are applied in
+    order; the items that aren't rendered yet simply wait their turn.
+    """
+
+    def __init__(self, rx_list, item_class, tight=True, layout_class=QVBoxLayout, key=None,
+                 pool_size=0, frame_budget=None):
         super(QWidget, self).__init__()
         self.rx = RxPortManager()
         self.rx.state = rx_list
-        self.rx.controller = RxBoxController(self)
-        self.rx.state._stream.subscribe(self.rx.controller)
         self.rx.item_class = item_class
         self.rx.layout_class = layout_class
+        self.rx.key = key
+        self.rx.pool = WidgetPool(pool_size) if pool_size else None
+        self.rx.frame_budget = frame_budget
+        self.rx.progress = BehaviorSubject((0, len(rx_list)))
         layout = self.rx.layout_class()
         if tight:
             layout.setContentsMargins(0,0,0,0)
-        for index, item in enumerate(self.rx.state._list):
-            layout.addWidget(self.rx.item_class(index, item))
         self.setLayout(layout)
+        self.rx.controller = RxBoxController(self)
+        self.rx.controller.render()
+        self.rx.state._stream.subscribe(self.rx.controller)
 
 
 class RxVBox(RxBox):
     """Reactive Vertical Box"""
 
-    def __init__(self, rx_list, item_class, tight=True):
-        super().__init__(rx_list, item_class, tight=tight, layout_class=QVBoxLayout)
+    def __init__(self, rx_list, item_class, tight=True, key=None, pool_size=0,
+                 frame_budget=None):
+        super().__init__(rx_list, item_class, tight=tight, layout_class=QVBoxLayout, key=key,
+                         pool_size=pool_size, frame_budget=frame_budget)
 
 
 class RxHBox(RxBox):
     """Reactive Horizontal Box"""
 
-    def __init__(self, rx_list, item_class, tight=True):
-        super().__init__(rx_list, item_class, tight=tight, layout_class=QHBoxLayout)
+    def __init__(self, rx_list, item_class, tight=True, key=None, pool_size=0,
+                 frame_budget=None):
+        super().__init__(rx_list, item_class, tight=tight, layout_class=QHBoxLayout, key=key,
+                         pool_size=pool_size, frame_budget=frame_budget)
+
+class RxVirtualBox(QAbstractScrollArea):
+    """Reactive virtualized vertical Box.
+
+    Takes the same ``(rx_list, item_class)`` arguments as :class:`RxBox`,
+    but only the rows inside the viewport (plus ``overscan`` rows above
+    and below) exist as widgets. All rows must have the same height,
+    which is given by ``item_height`` or measured from the first item.
+
+    Item widgets which implement ``rebind(index, item)`` are recycled
+    when they scroll out of view, instead of being destroyed.
+    """
+
+    def __init__(self, rx_list, item_class, item_height=None, overscan=2):
+        super(QAbstractScrollArea, self).__init__()
+        self.rx = RxPortManager()
+        self.rx.state = rx_list
+        self.rx.item_class = item_class
+        self.rx.item_height = item_height
+        self.rx.overscan = overscan
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.rx.controller = RxVirtualBoxController(self)
+        self.rx.state._stream.subscribe(self.rx.controller)
+
+    def scrollContentsBy(self, dx, dy):
+        self.rx.controller.layout_rows()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.rx.controller.layout_rows()
+
 
 def clear_widget(widget):
     while widget.layout().count() > 0:
@@ -371,82 +578,550 @@ def clear_widget(widget):
         child.setParent(None)
         widget.layout().removeWidget(child)
 
+def reindex_item(widget, index):
+    """Push a new index into an item widget through its ``rx.index`` port.
+
+    Returns ``False`` if the widget has no such port, in which case
+    it must be rebuilt to reflect the new index.
+    """
+    rx = getattr(widget, 'rx', None)
+    port = getattr(rx, 'index', None)
+    if port is None:
+        return False
+    port.on_next(index)
+    return True
+
+def longest_increasing_subsequence(seq):
+    """Returns the set of positions of a longest increasing subsequence of ``seq``.
+
+    Elements which are ``None`` are ignored.
+    """
+    # tails[k] is the position (in seq) of the smallest tail
+    # of all increasing subsequences of length k+1
+    tails = []
+    tail_values = []
+    previous = [None] * len(seq)
+    for pos, value in enumerate(seq):
+        if value is None:
+            continue
+        k = bisect.bisect_left(tail_values, value)
+        if k > 0:
+            previous[pos] = tails[k-1]
+        if k == len(tails):
+            tails.append(pos)
+            tail_values.append(value)
+        else:
+            tails[k] = pos
+            tail_values[k] = value
+
+    result = set()
+    pos = tails[-1] if tails else None
+    while pos is not None:
+        result.add(pos)
+        pos = previous[pos]
+    return result
+
+class WidgetPool(object):
+    """A bounded pool of hidden item widgets, kept for reuse.
+
+    Only widgets with a ``rebind(index, item)`` method are kept,
+    at most ``size`` for each item class. A widget may also define
+    ``reset()``, which is called when it enters the pool, to release
+    what it holds on to.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._free = collections.defaultdict(list)
+        # Counters
+        self.created = 0
+        self.reused = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return sum(len(widgets) for widgets in self._free.values())
+
+    def acquire(self, item_class, index, item):
+        """Returns a widget for the item, reused from the pool if possible."""
+        free = self._free.get(item_class)
+        if free:
+            widget = free.pop()
+            widget.rebind(index, item)
+            self.reused += 1
+            return widget
+        self.created += 1
+        return item_class(index, item)
+
+    def release(self, item_class, widget):
+        """Keep the widget for reuse. Returns ``False`` if it can't be kept."""
+        free = self._free[item_class]
+        if not hasattr(widget, 'rebind') or len(free) >= self.size:
+            self.dropped += 1
+            return False
+        reset = getattr(widget, 'reset', None)
+        if reset is not None:
+            reset()
+        free.append(widget)
+        return True
+
+    def clear(self):
+        """Destroy the widgets in the pool."""
+        for widgets in self._free.values():
+            for widget in widgets:
+                widget.setParent(None)
+        self._free.clear()
+
+    def stats(self):
+        """Returns the counters as a dict."""
+        return {'created': self.created,
+                'reused': self.reused,
+                'dropped': self.dropped,
+                'pooled': len(self)}
+
+
 class RxBoxController(Subject):
+    """Keeps the item widgets of a :class:`RxBox` in sync with its list.
+
+    The controller keeps a mirror of the items, so that it can update
+    only the widgets affected by each event. The layout always holds
+    the widgets of a prefix of the items; when rendering in slices,
+    the items after it are pending, and are only built by :meth:`render`.
+    """
 
     def __init__(self, widget):
         super(Subject, self).__init__()
         self.widget = widget
+        self.items = list(widget.rx.state._list)
+        self._timer = None
+
+    @property
+    def rendered(self):
+        """The number of items whose widgets are in the layout."""
+        return self.widget.layout().count()
+
+    @property
+    def pending(self):
+        """The number of items waiting to be rendered."""
+        return len(self.items) - self.rendered
+
+    def render(self):
+        """Build the widgets of the pending items.
+
+        Without a ``frame_budget`` they are all built now; otherwise
+        the first slice is built on the next iteration of the event loop.
+        """
+        if self.widget.rx.frame_budget is None:
+            self.render_all()
+            return
+        if self._timer is None:
+            self._timer = QTimer(self.widget)
+            self._timer.setSingleShot(True)
+            self._timer.timeout.connect(self._render_slice)
+        if not self._timer.isActive():
+            self._timer.start(0)
+
+    def render_all(self):
+        """Build the widgets of all the pending items now."""
+        if self._timer is not None:
+            self._timer.stop()
+        self._render_until(None)
+
+    def _render_slice(self):
+        deadline = time.perf_counter() + self.widget.rx.frame_budget / 1000
+        if self._render_until(deadline):
+            self._timer.start(0)
+
+    @contextlib.contextmanager
+    def _adding_widgets(self):
+        """Yields a function that adds a widget at the end of the layout.
+
+        In a visible box, showing each new widget would lay out the
+        whole box again; it is laid out once, at the end of the block.
+        """
+        layout = self.widget.layout()
+        visible = self.widget.isVisible()
+
+        def add(widget):
+            layout.addWidget(widget)
+            if visible:
+                widget.show()
+
+        layout.setEnabled(False)
+        try:
+            yield add
+        finally:
+            layout.setEnabled(True)
+            layout.update()
+
+    def _render_until(self, deadline):
+        # Returns True if there are items left to render
+        rendered = self.rendered
+        with self._adding_widgets() as add:
+            while rendered < len(self.items):
+                add(self._build(rendered, self.items[rendered]))
+                rendered += 1
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+        self.widget.rx.progress.on_next((rendered, len(self.items)))
+        return rendered < len(self.items)
+
+    def _build(self, index, item):
+        pool = self.widget.rx.pool
+        if pool is None:
+            return self.widget.rx.item_class(index, item)
+        widget = pool.acquire(self.widget.rx.item_class, index, item)
+        if widget.parentWidget() is self.widget:
+            # Reused from the pool, where it was hidden
+            widget.show()
+        return widget
+
+    def _discard(self, widget):
+        pool = self.widget.rx.pool
+        if pool is not None and pool.release(self.widget.rx.item_class, widget):
+            # The widget stays a hidden child of the box
+            self.widget.layout().removeWidget(widget)
+            widget.hide()
+            return
+        # Hiding explicitly cancels the show() that the layout may have
+        # queued, which would otherwise open the widget as a window
+        widget.hide()
+        widget.setParent(None)
+        self.widget.layout().removeWidget(widget)
+
+    def _take(self, index):
+        widget = self.widget.layout().takeAt(index).widget()
+        self._discard(widget)
+
+    def _clear(self):
+        # Taken from the end, so that the layout doesn't shift the other
+        # items, but discarded in order, which is faster for Qt
+        layout = self.widget.layout()
+        widgets = [layout.takeAt(i).widget() for i in range(layout.count() - 1, -1, -1)]
+        for widget in reversed(widgets):
+            self._discard(widget)
+
+    def _reindex(self, start):
+        """Update the index of the widgets from position ``start`` to the end.
+
+        Widgets that don't accept a new index are rebuilt. As inserting
+        in the middle of a layout costs as much as the rest of the layout,
+        the widgets after the first one that must be rebuilt are taken
+        out at once, and added back (or rebuilt) in order.
+        """
+        layout = self.widget.layout()
+        count = layout.count()
+        for index in range(start, count):
+            if not reindex_item(layout.itemAt(index).widget(), index):
+                break
+        else:
+            return
+        # From the end, so that the layout doesn't shift the other items
+        tail = [layout.takeAt(i).widget() for i in range(count - 1, index - 1, -1)]
+        tail.reverse()
+        kept = [reindex_item(widget, i) for i, widget in enumerate(tail, index)]
+        # All the stale widgets are discarded before any new one is built,
+        # which is much faster for Qt than interleaving both
+        for widget, keep in zip(tail, kept):
+            if not keep:
+                self._discard(widget)
+        with self._adding_widgets() as add:
+            for i, (widget, keep) in enumerate(zip(tail, kept), index):
+                add(widget if keep else self._build(i, self.items[i]))
+
+    def _indexable(self):
+        # Item widgets are all alike, so the first one tells
+        layout = self.widget.layout()
+        if layout.count() == 0:
+            return True
+        rx = getattr(layout.itemAt(0).widget(), 'rx', None)
+        return getattr(rx, 'index', None) is not None
+
+    def _rebuild(self, items):
+        # The items that weren't rendered yet stay pending
+        rendered = self.rendered if self.pending else len(items)
+        self.items = list(items)
+        layout = self.widget.layout()
+        if self.widget.rx.pool is None:
+            self._clear()
+            for index, item in enumerate(self.items[:rendered]):
+                layout.addWidget(self._build(index, item))
+            return
+        # Recycling widgets are rebound in place, so the layout doesn't change
+        for index in range(layout.count() - 1, len(self.items) - 1, -1):
+            self._take(index)
+        for index, item in enumerate(self.items[:rendered]):
+            if index >= layout.count():
+                layout.addWidget(self._build(index, item))
+                continue
+            widget = layout.itemAt(index).widget()
+            if hasattr(widget, 'rebind'):
+                widget.rebind(index, item)
+            else:
+                self._discard(widget)
+                layout.insertWidget(index, self._build(index, item))
+
+    def _reconcile(self, items):
+        """Reorder the item widgets to match ``items``, reusing widgets by key.
+
+        Only the widgets outside the longest run that is already in order
+        are moved inside the layout, and only the widgets whose item is
+        not present anymore are destroyed. If some items are pending,
+        only the rendered prefix of ``items`` is reconciled.
+        """
+        key = self.widget.rx.key
+        layout = self.widget.layout()
+        items = list(items)
+        widgets = [layout.itemAt(i).widget() for i in range(layout.count())]
+        # Old positions for each key (reversed so that pop() returns the first)
+        positions = dict()
+        for position, item in enumerate(self.items[:len(widgets)]):
+            positions.setdefault(key(item), []).append(position)
+        for stack in positions.values():
+            stack.reverse()
+        # Old position of the widget that will be reused in each new position
+        sources = []
+        for item in items[:len(widgets)]:
+            stack = positions.get(key(item))
+            sources.append(stack.pop() if stack else None)
+        # Destroy the widgets whose items are gone
+        for stack in positions.values():
+            for position in stack:
+                self._discard(widgets[position])
+        # Pull out the widgets that must move; the others stay in order
+        stable = longest_increasing_subsequence(sources)
+        for index, source in enumerate(sources):
+            if source is not None and index not in stable:
+                layout.removeWidget(widgets[source])
+
+        self.items = items
+        for index, source in enumerate(sources):
+            if source is None:
+                layout.insertWidget(index, self._build(index, items[index]))
+            else:
+                if index not in stable:
+                    layout.insertWidget(index, widgets[source])
+                if source != index and not reindex_item(widgets[source], index):
+                    self._discard(widgets[source])
+                    layout.insertWidget(index, self._build(index, items[index]))
 
     def on_next(self, event):
         typ, value = event
 
-        if typ == RxListEvent.append:
-            widget = self.widget.rx.item_class(len(self.widget.rx.state),
-                                               value)
-            self.widget.layout().addWidget(widget)
+        if typ == RxListEvent.batch:
+            # Apply all the changes before the box is repainted
+            self.widget.setUpdatesEnabled(False)
+            try:
+                for sub_event in value:
+                    self._apply(sub_event)
+            finally:
+                self.widget.setUpdatesEnabled(True)
+        else:
+            self._apply(event)
 
-        elif typ == RxListEvent.pop:
-            widget = self.widget.layout().takeAt(value).widget()
-            widget.setParent(None)
-            self.widget.layout().removeWidget(widget)
+        if typ not in (RxListEvent.append, RxListEvent.extend, RxListEvent.insert):
             self.widget.adjustSize()
 
-        elif typ == RxListEvent.insert:
-            i, (x, rest) = value
-            self.widget.layout()\
-                .insertWidget(i, self.widget.rx.item_class(i, x))
+    def _apply(self, event):
+        typ, value = event
 
-            while self.widget.layout().count() > i+1:
-                widget = self.widget.layout().takeAt(i+1).widget()
-                widget.setParent(None)
-                self.widget.layout().removeWidget(widget)
+        # Items at or after this position aren't rendered yet, so only
+        # the mirror is updated for them; they are built by render()
+        rendered = self.rendered
+
+        if typ == RxListEvent.append:
+            self.items.append(value)
+            if rendered == len(self.items) - 1:
+                self.widget.layout().addWidget(self._build(rendered, value))
 
-            # Rerender items after the inserted one because the indices have changed
-            for delta, state in enumerate(rest):
-                widget = self.widget.rx.item_class(i + 1 + delta,
-                                                   state)
-                self.widget.layout().addWidget(widget)
+        elif typ == RxListEvent.pop or typ == RxListEvent.delitem:
+            del self.items[value]
+            if value < rendered:
+                self._take(value)
+                self._reindex(value)
+
+        elif typ == RxListEvent.insert:
+            i, x = value
+            self.items.insert(i, x)
+            if i < rendered or rendered == len(self.items) - 1:
+                self.widget.layout().insertWidget(i, self._build(i, x))
+                # Only the indices of the items after the inserted one have changed
+                self._reindex(i + 1)
 
         elif typ == RxListEvent.extend:
-            initial_length = len(self.widget.rx.state) - len(value)
-            for delta, state in enumerate(value):
-                widget = self.widget.rx.item_class(initial_length + delta,
-                                                   state)
-                self.widget.layout().addWidget(widget)
+            self.items.extend(value)
+            self.render()
 
         elif typ == RxListEvent.clear:
-            while self.widget.layout().count() > 0:
-                widget = self.widget.layout().takeAt(0).widget()
-                widget.setParent(None)
-                self.widget.layout().removeWidget(widget)
-            self.widget.adjustSize()
+            self.items = []
+            self._clear()
 
         elif typ == RxListEvent.reverse or typ == RxListEvent.sort:
-            # The whole list must be redrawn, in case the widget
-            # value depends on the index in the list
-            while self.widget.layout().count() > 0:
-                widget = self.widget.layout().takeAt(0).widget()
-                widget.setParent(None)
-                self.widget.layout().removeWidget(widget)
+            if self.widget.rx.key is None or not self._indexable():
+                # Without a key we can't tell which widget belongs to
+                # which item, and without an index port the moved widgets
+                # would be rebuilt anyway, so the whole list is redrawn
+                self._rebuild(value)
+            else:
+                self._reconcile(value)
+
+        elif typ == RxListEvent.splice:
+            start, removed, inserted = value
+            for i in range(min(start + removed, rendered) - 1, start - 1, -1):
+                self._take(i)
+            self.items[start:start + removed] = inserted
+            # The inserted items must be built if there are rendered items
+            # after them; at the end, they are pending like extended ones
+            if start < self.rendered or self.widget.rx.frame_budget is None:
+                for delta, state in enumerate(inserted):
+                    self.widget.layout().insertWidget(start + delta, self._build(start + delta, state))
+                if removed != len(inserted):
+                    self._reindex(start + len(inserted))
+            else:
+                self.render()
+
+
+class RxVirtualBoxController(Subject):
+    """Keeps the live rows of a :class:`RxVirtualBox` in sync with its list.
+
+    Only the rows currently alive are touched by each event,
+    so the cost of an update depends on the viewport size,
+    not on the size of the list.
+    """
+
+    def __init__(self, widget):
+        super(Subject, self).__init__()
+        self.widget = widget
+        self.length = len(widget.rx.state)
+        self.item_height = widget.rx.item_height
+        # Maps row numbers to live widgets
+        self.rows = dict()
+        # Hidden widgets waiting to be rebound to another row
+        self.free = []
+        self.pool_size = 0
+        self._laying_out = False
+        self.layout_rows()
+
+    def _acquire(self, row):
+        item = self.widget.rx.state._list[row]
+        if self.free:
+            widget = self.free.pop()
+            widget.rebind(row, item)
+        else:
+            widget = self.widget.rx.item_class(row, item)
+            widget.setParent(self.widget.viewport())
+        widget.show()
+        return widget
+
+    def _release(self, widget):
+        if hasattr(widget, 'rebind') and len(self.free) < self.pool_size:
+            widget.hide()
+            self.free.append(widget)
+        else:
+            widget.setParent(None)
+
+    def _invalidate(self):
+        for widget in self.rows.values():
+            self._release(widget)
+        self.rows = dict()
+
+    def _shift(self, start, delta):
+        """Move the live widgets in rows ``start`` and after by ``delta`` rows."""
+        rows = dict()
+        for row, widget in self.rows.items():
+            if row >= start:
+                row += delta
+                if not reindex_item(widget, row):
+                    # The widget will be rebuilt (or rebound) by layout_rows()
+                    self._release(widget)
+                    continue
+            rows[row] = widget
+        self.rows = rows
+
+    def _remove(self, row):
+        widget = self.rows.pop(row, None)
+        if widget is not None:
+            self._release(widget)
+        self._shift(row + 1, -1)
+        self.length -= 1
+
+    def layout_rows(self):
+        """Create, recycle and position the widgets for the visible rows."""
+        if self._laying_out:
+            return
+        self._laying_out = True
+        try:
+            viewport = self.widget.viewport()
+            if self.item_height is None:
+                if self.length == 0:
+                    return
+                self.rows[0] = self._acquire(0)
+                self.item_height = max(1, self.rows[0].sizeHint().height())
+
+            height = self.item_height
+            bar = self.widget.verticalScrollBar()
+            bar.setRange(0, max(0, self.length * height - viewport.height()))
+            bar.setPageStep(viewport.height())
+            bar.setSingleStep(height)
+
+            offset = bar.value()
+            overscan = self.widget.rx.overscan
+            first = max(0, offset // height - overscan)
+            stop = min(self.length, (offset + viewport.height()) // height + 1 + overscan)
+            self.pool_size = max(0, stop - first)
+
+            for row in [row for row in self.rows if not first <= row < stop]:
+                self._release(self.rows.pop(row))
+            for row in range(first, stop):
+                widget = self.rows.get(row)
+                if widget is None:
+                    widget = self.rows[row] = self._acquire(row)
+                widget.setGeometry(0, row * height - offset, viewport.width(), height)
+        finally:
+            self._laying_out = False
+
+    def on_next(self, event):
+        typ, value = event
+        if typ == RxListEvent.batch:
+            for sub_event in value:
+                self._apply(sub_event)
+        else:
+            self._apply(event)
+        self.layout_rows()
+
+    def _apply(self, event):
+        typ, value = event
 
-            for i, state in enumerate(value):
-                widget = self.widget.rx.item_class(i, state)
-                self.widget.layout().addWidget(widget)
+        if typ == RxListEvent.append:
+            self.length += 1
+
+        elif typ == RxListEvent.extend:
+            # RxList.extend() emits a list, even when given an iterator
+            self.length += len(value)
+
+        elif typ == RxListEvent.insert:
+            i, _ = value
+            self._shift(i, 1)
+            self.length += 1
+
+        elif typ == RxListEvent.pop:
+            self._remove(value)
 
         elif typ == RxListEvent.delitem:
-            if isinstance(value, slice):
-                widgets = []
-                # Collect the widgets
-                for i in range(value.start, value.stop, value.step):
-                    widget = self.widget.layout().takeAt(i).widget()
-                    widgets.append(widget)
-                # Delete them
-                for widget in widgets:
-                    widget.setParent(None)
-                    self.widget.layout().removeWidget(widget)
-                self.widget.adjustSize()
-            else:
-                widget = self.widget.layout().takeAt(value).widget()
-                widget.setParent(None)
-                self.widget.layout().removeWidget(widget)
-                self.widget.adjustSize()
+            self._remove(value)
+
+        elif typ == RxListEvent.splice:
+            start, removed, inserted = value
+            for row in range(start, start + removed):
+                widget = self.rows.pop(row, None)
+                if widget is not None:
+                    self._release(widget)
+            if removed != len(inserted):
+                self._shift(start + removed, len(inserted) - removed)
+            self.length += len(inserted) - removed
+
+        elif typ == RxListEvent.clear:
+            self._invalidate()
+            self.length = 0
+
+        elif typ == RxListEvent.reverse or typ == RxListEvent.sort:
+            self._invalidate()
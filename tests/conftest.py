@@ -0,0 +1,13 @@
+import os
+
+import pytest
+
+# The tests don't need a display
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    """The QApplication shared by all the tests"""
+    from qtpy.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
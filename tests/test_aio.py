@@ -0,0 +1,85 @@
+import asyncio
+import socket
+import time
+
+from rx.subjects import Subject
+
+from reaqt.aio import QtAsyncioBridge
+
+
+def process_events(qapp, seconds, until=lambda: False):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end and not until():
+        qapp.processEvents()
+        time.sleep(0.001)
+
+
+def count_iterations(loop):
+    # The loop looks up _run_once on the instance on each iteration
+    counter = [0]
+    run_once = loop._run_once
+
+    def counted():
+        counter[0] += 1
+        run_once()
+
+    loop._run_once = counted
+    return counter
+
+
+def test_idle_reader_doesnt_wake_the_gui(qapp):
+    bridge = QtAsyncioBridge()
+    a, b = socket.socketpair()
+    received = []
+
+    async def read():
+        reader, _ = await asyncio.open_connection(sock=a)
+        received.append(await reader.readline())
+
+    bridge.create_task(read())
+    process_events(qapp, 0.1)
+    iterations = count_iterations(bridge.loop)
+    process_events(qapp, 0.3)
+    assert iterations[0] <= 2
+
+    b.sendall(b'hello\n')
+    process_events(qapp, 2, lambda: received)
+    assert received == [b'hello\n']
+    bridge.close()
+    b.close()
+
+
+def test_timers_and_next_value(qapp):
+    bridge = QtAsyncioBridge()
+    subject = Subject()
+    results = []
+
+    async def run():
+        await asyncio.sleep(0.05)
+        results.append('slept')
+        results.append(await bridge.next_value(subject))
+
+    bridge.create_task(run())
+    process_events(qapp, 2, lambda: results)
+    assert results == ['slept']
+    subject.on_next(42)
+    process_events(qapp, 2, lambda: len(results) == 2)
+    assert results == ['slept', 42]
+    assert not bridge.polling
+    bridge.close()
+
+
+def test_foreign_loop_is_polled(qapp):
+    loop = asyncio.new_event_loop()
+    bridge = QtAsyncioBridge(loop, interval=1)
+    assert bridge.polling
+    results = []
+
+    async def run():
+        await asyncio.sleep(0.01)
+        results.append('done')
+
+    bridge.create_task(run())
+    process_events(qapp, 2, lambda: results)
+    assert results == ['done']
+    bridge.close()
@@ -0,0 +1,49 @@
+import numpy
+
+from reaqt.widgets import RxWidget, RxLabel, RxSlider
+from reaqt.arrays import RxArray
+from reaqt.common import connect
+from reaqt.state import RxMap
+from reaqt.utils.layout import vbox
+
+from qtpy.QtWidgets import QApplication
+from qtpy.QtCore import Qt
+
+class TraceWidget(RxWidget):
+
+    def __init__(self, parent=None):
+        super(TraceWidget, self).__init__(parent)
+
+        s_gain = RxSlider(Qt.Horizontal, minimum=1, maximum=10)
+        l_gain = RxLabel(lambda v: "Gain: {}".format(v))
+        l_trace = RxLabel(lambda trace: "Mean: {:.4f}, peak: {:.4f}".format(
+            trace.mean(), numpy.abs(trace).max()))
+
+        self.setLayout(vbox(l_gain, s_gain, l_trace))
+
+        signal = numpy.sin(numpy.linspace(0, 100 * numpy.pi, 1000000))
+        self.state = RxMap({"gain": 1, "trace": RxArray(signal)})
+
+        def set_gain(gain):
+            trace = self.state["trace"]
+            # A million samples are rewritten, but the label
+            # is only notified once
+            trace[:] = signal * gain
+
+        self.state["trace"]._stream.map(lambda _: self.state["trace"].freeze()).subscribe(l_trace.rx.text)
+        self.state["gain"].subscribe(set_gain)
+        self.state["gain"].subscribe(l_gain.rx.text)
+        connect(self.state["gain"], s_gain.rx.value)
+
+
+def test_main():
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = TraceWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
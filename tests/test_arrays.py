@@ -0,0 +1,30 @@
+import numpy
+
+from reaqt.arrays import RxArray, RxArrayEvent, RxArrayRange
+
+
+def record(subject):
+    values = []
+    subject.subscribe(values.append)
+    return values
+
+
+def test_rows_of_a_boolean_mask():
+    a = RxArray(numpy.arange(12).reshape(4, 3))
+    events = record(a._stream)
+    a[a[:] > 7] = -1
+    assert events == [(RxArrayEvent.change, RxArrayRange(2, 4))]
+    a[[False, True, False, True]] = 0
+    assert events[-1] == (RxArrayEvent.change, RxArrayRange(1, 4))
+    a[a[:] > 100] = 0
+    assert len(events) == 2
+    assert a[:].tolist() == [[0, 1, 2], [0, 0, 0], [6, 7, -1], [0, 0, 0]]
+
+
+def test_rows_of_an_integer_array():
+    a = RxArray(numpy.zeros((5, 2)))
+    events = record(a._stream)
+    a[[3, -5]] = 1
+    assert events == [(RxArrayEvent.change, RxArrayRange(0, 4))]
+    a[numpy.array([[1], [2]])] = 2
+    assert events[-1] == (RxArrayEvent.change, RxArrayRange(1, 3))
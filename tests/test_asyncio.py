@@ -0,0 +1,72 @@
+"""
+ReaQt example: asyncio sources
+"""
+import asyncio
+import sys
+
+from qtpy.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout # pylint: disable=E0611
+
+from reaqt import aio
+from reaqt.widgets import RxLabel, RxPushButton, RxVBox
+from reaqt.state import RxMap, RxList
+
+async def clock():
+    seconds = 0
+    while True:
+        yield seconds
+        await asyncio.sleep(1)
+        seconds += 1
+
+async def process_output():
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, '-c', 'import time\nfor i in range(10):\n print("line", i, flush=True)\n time.sleep(0.5)',
+        stdout=asyncio.subprocess.PIPE)
+    async for line in process.stdout:
+        yield line.decode().strip()
+
+class MyWidget(QWidget):
+    """ReaQt example: asyncio sources"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.state = RxMap({'seconds': 0, 'message': "Click the button twice", 'lines': RxList([])})
+
+        seconds = RxLabel(lambda s: "Running for {} s".format(s))
+        message = RxLabel()
+        button = RxPushButton("Click me")
+        lines = RxVBox(self.state['lines'], lambda index, line: QLabel(line))
+
+        self.state['seconds'].subscribe(seconds.rx.text)
+        self.state['message'].subscribe(message.rx.text)
+
+        # Both sources run on the GUI thread, without blocking it
+        aio.feed(clock(), self.state, 'seconds')
+        aio.feed(process_output(), self.state['lines'])
+
+        async def count_clicks():
+            await aio.next_value(button.rx.clicked)
+            self.state['message'] = "Once more"
+            await aio.next_value(button.rx.clicked)
+            self.state['message'] = "Done"
+
+        aio.create_task(count_clicks())
+
+        layout = QVBoxLayout()
+        layout.addWidget(seconds)
+        layout.addWidget(message)
+        layout.addWidget(button)
+        layout.addWidget(lines)
+        self.setLayout(layout)
+
+
+def test_main():
+    """Run the example"""
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
@@ -0,0 +1,54 @@
+"""
+ReaQt example: Reactive Combo Box with a long list of options
+"""
+from qtpy.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout # pylint: disable=E0611
+
+from reaqt.widgets import RxComboBox, RxLabel, RxPushButton
+from reaqt.common import connect
+from reaqt.state import RxMap, RxList
+
+class MyWidget(QWidget):
+    """ReaQt example: Reactive Combo Box with a long list of options"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.state = RxMap({'part': 'P-004242',
+                            'parts': RxList(['P-{:06d}'.format(i) for i in range(100000)])})
+
+        # Type part of a number to get the matching parts
+        combo = RxComboBox(self.state['parts'], filterable=True)
+        selected = RxLabel(lambda part: "Selected: {}".format(part))
+        addButton = RxPushButton("Add a part at the start")
+        lastButton = RxPushButton("Select the last part")
+
+        connect(self.state['part'], combo.rx.value)
+        self.state['part'].subscribe(selected.rx.text)
+        # Only the new row is added to the combo box
+        addButton.rx.clicked.subscribe(
+            lambda _: self.state['parts'].insert(0, 'N-{:06d}'.format(len(self.state['parts']))))
+        # The row is found by a hash lookup
+        lastButton.rx.clicked.subscribe(
+            lambda _: self.state.__setitem__('part', self.state['parts'][-1]))
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Choose one of 100 000 parts:"))
+        layout.addWidget(combo)
+        layout.addWidget(selected)
+        layout.addWidget(addButton)
+        layout.addWidget(lastButton)
+        self.setLayout(layout)
+
+
+def test_main():
+    """Run the example"""
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
@@ -0,0 +1,98 @@
+import pytest
+from qtpy.QtCore import QObject
+
+from reaqt.common import FakeObservable, RxObserver, RxPort
+from reaqt.state import RxBehaviorStream, RxMap, RxStream, make_equality
+from reaqt.widgets import RxSpinBox
+
+
+def test_equality_descriptions():
+    assert make_equality(None) is None
+    assert make_equality('equal')([1], [1])
+    assert not make_equality('identity')([1], [1])
+    close = make_equality(0.5)
+    assert close(1.0, 1.4)
+    assert not close(1.0, 1.6)
+    assert close('a', 'a')
+
+
+def test_streams_dont_emit_equal_values():
+    stream = RxStream(1, equality='equal')
+    values = []
+    stream.subscribe(values.append)
+    for value in (1, 2, 2, 3, 3, 3):
+        stream.on_next(value)
+    assert values == [2, 3]
+    assert stream.suppressed == 4
+
+    # Behavior streams also send the current value on subscription
+    stream = RxBehaviorStream(1, equality='equal')
+    values = []
+    stream.subscribe(values.append)
+    for value in (1, 2, 2, 3):
+        stream.on_next(value)
+    assert values == [1, 2, 3]
+    assert stream.suppressed == 2
+
+
+def test_map_equality():
+    state = RxMap({'x': 0.0}, equality=0.01)
+    values = []
+    state['x'].subscribe(values.append)
+    state['x'] = 0.005
+    state['x'] = 1.0
+    state['x'] = 1.001
+    assert values == [0.0, 1.0]
+    assert state['x'].suppressed == 2
+
+
+def test_port_doesnt_set_the_value_the_widget_shows(qapp):
+    applied = []
+    port = RxPort(RxObserver(QObject(), applied.append), FakeObservable(), equality='equal')
+    for value in (1, 1, 2, 2):
+        port.on_next(value)
+    assert applied == [1, 2]
+    assert port.suppressed == 2
+
+
+def test_port_doesnt_echo_the_value_it_received(qapp):
+    spin = RxSpinBox()
+    spin.rx.value.set_equality('equal')
+    emitted = []
+    spin.rx.value.subscribe(emitted.append)
+    spin.rx.value.on_next(5)
+    assert spin.value() == 5
+    # The widget sends back the value it was given: it isn't a change
+    spin.rx.value.stream.on_next(5)
+    assert emitted == []
+    spin.setValue(6)
+    assert emitted == [6]
+    assert spin.rx.value.suppressed == 1
+
+
+def test_ports_are_created_when_first_accessed(qapp):
+    spin = RxSpinBox()
+    assert not spin.rx.is_created('value')
+    assert not spin.rx.is_created('minimum')
+    port = spin.rx.value
+    assert spin.rx.is_created('value')
+    assert spin.rx.value is port
+    assert port.name == 'value'
+    assert not spin.rx.is_created('minimum')
+
+
+def test_signals_are_connected_on_first_subscription(qapp):
+    spin = RxSpinBox()
+    stream = spin.rx.value.stream
+    assert not stream.connected
+    values = []
+    spin.rx.value.subscribe(values.append)
+    assert stream.connected
+    spin.setValue(4)
+    assert values == [4]
+
+
+def test_unknown_ports_raise_attribute_error(qapp):
+    spin = RxSpinBox()
+    with pytest.raises(AttributeError):
+        spin.rx.nothing
@@ -0,0 +1,65 @@
+
+from reaqt.widgets import RxWidget, RxLabel, RxSlider
+from reaqt.common import connect
+from reaqt.state import RxMap, RxComputed
+from reaqt.utils.layout import vbox
+from reaqt.utils.misc import format_float
+
+from qtpy.QtWidgets import QApplication
+from qtpy.QtCore import Qt
+
+def calc_bmi(height, weight):
+    return weight / ((height / 100)**2)
+
+def classify(bmi):
+    if bmi < 18.5:
+        return "underweight"
+    elif bmi < 25:
+        return "normal"
+    else:
+        return "overweight"
+
+class ComputedBmiWidget(RxWidget):
+
+    def __init__(self, parent=None):
+        super(ComputedBmiWidget, self).__init__(parent)
+
+        s_h = RxSlider(Qt.Horizontal, minimum=50, maximum=230)
+        s_w = RxSlider(Qt.Horizontal, minimum=1, maximum=250)
+
+        l_h = RxLabel(lambda v: "Height: {} cm".format(v))
+        l_w = RxLabel(lambda v: "Weight: {} kg".format(v))
+        l_b = RxLabel(lambda v: "BMI: " + format_float(v, 1))
+        l_s = RxLabel(lambda s: "{} ({})".format(*s))
+
+        self.setLayout(vbox(l_h, s_h, l_w, s_w, l_b, l_s))
+
+        self.state = RxMap({"h": 172, "w": 62})
+        # The summary depends on the height both directly and through the BMI.
+        # It is still computed only once each time the height changes,
+        # and never from a mix of the old and the new height.
+        bmi = RxComputed(calc_bmi, self.state["h"], self.state["w"])
+        summary = RxComputed(lambda bmi, h: (classify(bmi), "{} cm".format(h)),
+                             bmi, self.state["h"])
+        self.state.add_items({"bmi": bmi, "summary": summary})
+
+        connect(self.state["h"], s_h.rx.value)
+        connect(self.state["w"], s_w.rx.value)
+
+        self.state["h"].subscribe(l_h.rx.text)
+        self.state["w"].subscribe(l_w.rx.text)
+        self.state["bmi"].subscribe(l_b.rx.text)
+        self.state["summary"].subscribe(l_s.rx.text)
+
+
+def test_main():
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = ComputedBmiWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
@@ -0,0 +1,49 @@
+from qtpy.QtWidgets import QApplication, QGridLayout, QWidget, QLabel
+from qtpy.QtCore import Qt
+
+from reaqt.widgets import RxLabel, RxSlider, RxPushButton
+from reaqt.common import connect
+from reaqt.scheduling import FrameScheduler
+from reaqt.state import RxMap
+
+class MyWidget(QWidget):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.state = RxMap({"value": 0})
+
+        slider = RxSlider(Qt.Horizontal, minimum=0, maximum=10000)
+        value_display = RxLabel()
+
+        connect(self.state["value"], slider.rx.value)
+        self.state["value"].subscribe(value_display.rx.text)
+
+        # The label is updated at most once every 16 ms (about 60 times per second),
+        # no matter how fast the slider is moving. Intermediate values are dropped.
+        self.scheduler = FrameScheduler(interval=16)
+        self.scheduler.attach(value_display.rx.text)
+
+        stats_button = RxPushButton("&Stats")
+        stats_button.rx.clicked.subscribe(lambda x: print(self.scheduler.stats()))
+
+        grid = QGridLayout()
+        grid.addWidget(QLabel("Input:"), 0, 0)
+        grid.addWidget(slider, 0, 1)
+        grid.addWidget(QLabel("Display:"), 1, 0)
+        grid.addWidget(value_display, 1, 1)
+        grid.addWidget(stats_button, 2, 0, 1, 2)
+        self.setLayout(grid)
+
+
+def test_main():
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
@@ -0,0 +1,71 @@
+from reaqt import graph
+from reaqt.common import connect
+from reaqt.graph import Graph
+from reaqt.profiling import widget_label
+from reaqt.state import RxMap
+from reaqt.widgets import RxSpinBox
+
+
+def diamond():
+    g = Graph()
+    for name in 'abcd':
+        g.add_node(name, 'subject')
+    g.add_edge('a', 'b')
+    g.add_edge('a', 'c')
+    g.add_edge('b', 'd')
+    g.add_edge('c', 'd')
+    return g
+
+
+def test_fan_out_and_propagation():
+    g = diamond()
+    assert g.fan_out() == {'a': 2, 'b': 1, 'c': 1, 'd': 0}
+    propagation = g.propagation()
+    assert propagation['a'] == {'depth': 2, 'updates': 4}
+    assert propagation['d'] == {'depth': 0, 'updates': 0}
+    assert g.hotspots(threshold=4) == {'a': 4}
+
+
+def test_propagation_of_a_long_chain():
+    g = Graph()
+    for i in range(3000):
+        g.add_node(i, 'subject')
+        if i > 0:
+            g.add_edge(i - 1, i)
+    # A back edge is ignored
+    g.add_edge(2999, 0)
+    propagation = g.propagation()
+    assert propagation[0] == {'depth': 2999, 'updates': 2999}
+    assert propagation[2998] == {'depth': 1, 'updates': 1}
+
+
+def test_cycles_through_a_widget_are_cut():
+    g = diamond()
+    g.add_edge('d', 'a', blocked=True)
+    assert g.cycles() == [{'nodes': ['a', 'b', 'c', 'd'], 'cut_by_signals_blocked': True}]
+    g.add_edge('d', 'a')
+    assert g.cycles() == [{'nodes': ['a', 'b', 'c', 'd'], 'cut_by_signals_blocked': False}]
+
+
+def test_records_bindings(qapp):
+    graph.reset()
+    graph.enable()
+    try:
+        state = RxMap({'value': 1})
+        spin = RxSpinBox()
+        connect(state['value'], spin.rx.value)
+    finally:
+        graph.disable()
+    assert not graph.is_enabled()
+
+    g = graph.graph()
+    port = '{}.value'.format(widget_label(spin))
+    key = "RxMap#{:x}['value']".format(id(state))
+    assert g.nodes[key] == 'state'
+    assert g.nodes[port + ' (set)'] == 'set'
+    assert g.nodes[port + ' (emit)'] == 'emit'
+    assert port + ' (set)' in g.edges[key]
+    assert key in g.edges[port + ' (emit)']
+    # The two-way binding is a cycle cut by the blocked signals of the widget
+    assert [cycle['cut_by_signals_blocked'] for cycle in graph.cycles()] == [True]
+    graph.reset()
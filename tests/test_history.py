@@ -0,0 +1,70 @@
+"""
+ReaQt example: undo and redo
+"""
+from qtpy.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout # pylint: disable=E0611
+
+from reaqt.widgets import RxLineEdit, RxPushButton, RxVBox
+from reaqt.common import connect
+from reaqt.history import History
+from reaqt.state import RxMap, RxList
+
+class MyWidget(QWidget):
+    """ReaQt example: undo and redo"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.state = RxMap({'title': 'Shopping list', 'items': RxList(['Bread'])})
+        # Only the inverse of each change is kept, not copies of the state
+        self.history = History(self.state)
+
+        title = RxLineEdit()
+        addButton = RxPushButton("Add three items (one step)")
+        sortButton = RxPushButton("Sort the items")
+        undoButton = RxPushButton("Undo")
+        redoButton = RxPushButton("Redo")
+        items = RxVBox(self.state['items'], lambda index, item: QLabel(item))
+
+        connect(self.state['title'], title.rx.text)
+
+        def add_items():
+            with self.history.step("Add items"):
+                for item in ['Milk', 'Eggs', 'Apples']:
+                    self.state['items'].append(item)
+
+        addButton.rx.clicked.subscribe(lambda _: add_items())
+        sortButton.rx.clicked.subscribe(lambda _: self.state['items'].sort())
+        undoButton.rx.clicked.subscribe(lambda _: self.history.undo())
+        redoButton.rx.clicked.subscribe(lambda _: self.history.redo())
+
+        def update_buttons(status):
+            can_undo, can_redo = status
+            undoButton.setEnabled(can_undo)
+            redoButton.setEnabled(can_redo)
+
+        self.history.status.subscribe(update_buttons)
+        update_buttons((False, False))
+
+        layout = QVBoxLayout()
+        layout.addWidget(title)
+        layout.addWidget(items)
+        layout.addStretch(1)
+        layout.addWidget(addButton)
+        layout.addWidget(sortButton)
+        layout.addWidget(undoButton)
+        layout.addWidget(redoButton)
+        self.setLayout(layout)
+
+
+def test_main():
+    """Run the example"""
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
@@ -0,0 +1,61 @@
+"""
+ReaQt example: input policies
+"""
+from qtpy.QtCore import Qt # pylint: disable=E0611
+from qtpy.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout # pylint: disable=E0611
+
+from reaqt.widgets import RxLabel, RxLineEdit, RxSlider
+from reaqt.scheduling import Debounce, Throttle
+from reaqt.state import RxMap
+
+WORDS = ["{}{}".format(a, b) for a in "abcdefghijklmnopqrstuvwxyz" for b in range(2000)]
+
+def search(query):
+    # Deliberately slow
+    return [word for word in WORDS if query and word.startswith(query)]
+
+class MyWidget(QWidget):
+    """ReaQt example: input policies"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.state = RxMap({'query': '', 'value': 0})
+
+        query = RxLineEdit(realtime=True)
+        results = RxLabel(lambda query: "{} results".format(len(search(query))))
+        slider = RxSlider(Qt.Horizontal, minimum=0, maximum=1000)
+        value = RxLabel(lambda v: "Value: {}".format(v))
+
+        # The search runs once the user stops typing for 300 ms
+        query.rx.text.set_policy(Debounce(300))
+        # The value is updated at most every 100 ms while dragging,
+        # and the final position is never lost
+        slider.rx.value.set_policy(Throttle(100))
+
+        query.rx.text.subscribe(lambda text: self.state.__setitem__('query', text))
+        slider.rx.value.subscribe(lambda v: self.state.__setitem__('value', v))
+        self.state['query'].subscribe(results.rx.text)
+        self.state['value'].subscribe(value.rx.text)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Search:"))
+        layout.addWidget(query)
+        layout.addWidget(results)
+        layout.addWidget(slider)
+        layout.addWidget(value)
+        self.setLayout(layout)
+
+
+def test_main():
+    """Run the example"""
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
@@ -0,0 +1,62 @@
+"""
+ReaQt example: persisting the state with a journal
+"""
+import os
+import tempfile
+
+from qtpy.QtCore import QTimer # pylint: disable=E0611
+from qtpy.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout # pylint: disable=E0611
+
+from reaqt.widgets import RxLineEdit, RxPushButton, RxVBox
+from reaqt.common import connect
+from reaqt.journal import Journal
+from reaqt.state import RxMap, RxList
+
+class MyWidget(QWidget):
+    """ReaQt example: persisting the state with a journal"""
+
+    def __init__(self, path, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.state = RxMap({'title': 'Notes', 'notes': RxList([])})
+        # The state of the previous run (if any) is restored here
+        self.journal = Journal(self.state, path, snapshot_every=100)
+
+        # Only the changes are written, so saving often is cheap
+        self.autosave = QTimer(self)
+        self.autosave.timeout.connect(self.journal.flush)
+        self.autosave.start(1000)
+
+        title = RxLineEdit()
+        addButton = RxPushButton("Add a note")
+        popButton = RxPushButton("Remove the last note")
+        notes = RxVBox(self.state['notes'], lambda index, note: QLabel(note))
+
+        connect(self.state['title'], title.rx.text)
+        addButton.rx.clicked.subscribe(
+            lambda _: self.state['notes'].append("Note #{}".format(len(self.state['notes']))))
+        popButton.rx.clicked.subscribe(
+            lambda _: len(self.state['notes']) and self.state['notes'].pop())
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Restart the example: the notes are kept in " + path))
+        layout.addWidget(title)
+        layout.addWidget(addButton)
+        layout.addWidget(popButton)
+        layout.addWidget(notes)
+        self.setLayout(layout)
+
+
+def test_main():
+    """Run the example"""
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget(os.path.join(tempfile.gettempdir(), "reaqt-notes.journal"))
+    widget.show()
+    app.aboutToQuit.connect(widget.journal.flush)
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
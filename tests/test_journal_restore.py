@@ -0,0 +1,59 @@
+import random
+
+from reaqt.journal import Journal
+from reaqt.state import RxList, RxMap
+
+
+def restored(path):
+    state = RxMap({'title': '', 'items': RxList([])})
+    Journal(state, path).close()
+    return state['title'].current_value, list(state['items'])
+
+
+def test_snapshot_waits_for_the_end_of_a_batch(tmp_path):
+    path = str(tmp_path / 'state.journal')
+    state = RxMap({'title': '', 'items': RxList([])})
+    journal = Journal(state, path, snapshot_every=2)
+    state['items'].append(9)
+    with state['items'].batch():
+        state['items'].insert(0, 0)
+        state['items'].pop()
+    journal.close()
+    assert restored(path) == ('', [0])
+
+
+def test_restore_after_random_batched_edits(tmp_path):
+    rng = random.Random(0)
+    for run in range(30):
+        path = str(tmp_path / 'state{}.journal'.format(run))
+        state = RxMap({'title': '', 'items': RxList([])})
+        journal = Journal(state, path, snapshot_every=rng.randrange(1, 8))
+        items = state['items']
+
+        def edit():
+            n = len(items)
+            operation = rng.randrange(6)
+            if operation == 0:
+                items.append(rng.randrange(100))
+            elif operation == 1:
+                items.insert(rng.randrange(n + 1), rng.randrange(100))
+            elif operation == 2 and n:
+                items.pop(rng.randrange(n))
+            elif operation == 3:
+                i = rng.randrange(n + 1)
+                items.splice(i, rng.randrange(i, n + 1), [rng.randrange(100)])
+            elif operation == 4:
+                items.sort()
+            else:
+                state['title'] = str(rng.randrange(100))
+
+        for _ in range(40):
+            if rng.random() < 0.5:
+                # Batches of the list itself are flushed while the map isn't batching
+                with rng.choice([state, items]).batch():
+                    for _ in range(rng.randrange(1, 5)):
+                        edit()
+            else:
+                edit()
+        journal.close()
+        assert restored(path) == (state['title'].current_value, list(items))
@@ -0,0 +1,62 @@
+"""
+ReaQt example: Reactive Vertical Box with keyed items
+"""
+
+from qtpy.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout # pylint: disable=E0611
+
+from reaqt.widgets import RxVBox, RxLabel, RxPushButton
+from reaqt.state import RxList
+
+class MyWidget(QWidget):
+    """ReaQt example: Reactive Vertical Box with keyed items"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        class Item(RxLabel):
+            """Item whose index is updated in place when it moves"""
+
+            def __init__(self, index, value):
+                super().__init__(insert=lambda i: "Item #{} is '{}'.".format(i, value))
+                # Exposing an `index` port lets the box reuse this widget
+                # when the item changes position.
+                self.rx.index = self.rx.text
+                self.rx.index.on_next(index)
+
+        self.state = RxList(['C', 'A', 'B'])
+
+        insert0Button = RxPushButton("self.state.insert(0, 'Z')")
+        popButton = RxPushButton("self.state.pop(0)")
+        reverseButton = RxPushButton("self.state.reverse()")
+        sortButton = RxPushButton("self.state.sort()")
+
+        insert0Button.rx.clicked.subscribe(lambda _: self.state.insert(0, 'Z'))
+        popButton.rx.clicked.subscribe(lambda _: len(self.state) and self.state.pop(0))
+        reverseButton.rx.clicked.subscribe(lambda _: self.state.reverse())
+        sortButton.rx.clicked.subscribe(lambda _: self.state.sort())
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Items are matched by their value on sort and reverse."))
+        layout.addWidget(RxVBox(self.state, Item, key=lambda item: item))
+        layout.addStretch(1)
+        layout.addWidget(insert0Button)
+        layout.addWidget(popButton)
+        layout.addWidget(reverseButton)
+        layout.addWidget(sortButton)
+
+        self.setLayout(layout)
+
+
+
+def test_main():
+    """Run the example"""
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
@@ -0,0 +1,58 @@
+"""
+ReaQt example: Reactive List Model
+"""
+
+from qtpy.QtWidgets import QApplication, QWidget, QLabel, QListView, QVBoxLayout # pylint: disable=E0611
+
+from reaqt.widgets import RxPushButton
+from reaqt.models import RxListModel
+from reaqt.state import RxList
+
+class MyWidget(QWidget):
+    """ReaQt example: Reactive List Model"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.state = RxList(['C', 'A', 'B'])
+
+        appendButton = RxPushButton("self.state.append('X')")
+        insert0Button = RxPushButton("self.state.insert(0, 'Z')")
+        popButton = RxPushButton("self.state.pop()")
+        sortButton = RxPushButton("self.state.sort()")
+        clearButton = RxPushButton("self.state.clear()")
+
+        appendButton.rx.clicked.subscribe(lambda _: self.state.append('X'))
+        insert0Button.rx.clicked.subscribe(lambda _: self.state.insert(0, 'Z'))
+        popButton.rx.clicked.subscribe(lambda _: len(self.state) and self.state.pop())
+        sortButton.rx.clicked.subscribe(lambda _: self.state.sort())
+        clearButton.rx.clicked.subscribe(lambda _: self.state.clear())
+
+        view = QListView()
+        view.setModel(RxListModel(self.state, display=lambda item: "Item '{}'".format(item)))
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("This list is shown by a QListView."))
+        layout.addWidget(view)
+        layout.addWidget(appendButton)
+        layout.addWidget(insert0Button)
+        layout.addWidget(popButton)
+        layout.addWidget(sortButton)
+        layout.addWidget(clearButton)
+
+        self.setLayout(layout)
+
+
+
+def test_main():
+    """Run the example"""
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
@@ -0,0 +1,44 @@
+from qtpy.QtCore import QModelIndex, Qt
+from qtpy.QtTest import QAbstractItemModelTester
+
+from reaqt.models import RxListModel, RxTableModel
+from reaqt.state import RxList, RxTable
+
+
+def make_table():
+    return RxTable([('name', str), ('value', float)], [['a', 1.0], ['b', 2.0]])
+
+
+def test_table_model_rejects_values_that_cant_be_converted(qapp):
+    table = make_table()
+    model = RxTableModel(table, editable=True, coalesce=False)
+    assert not model.setData(model.index(0, 1), 'abc')
+    assert table[0, 1] == 1.0
+    assert model.setData(model.index(0, 1), '3.5')
+    assert table[0, 1] == 3.5
+    assert model.data(model.index(0, 1), Qt.EditRole) == 3.5
+
+
+def test_table_model_root_is_not_editable(qapp):
+    model = RxTableModel(make_table(), editable=True)
+    assert not model.flags(QModelIndex()) & Qt.ItemIsEditable
+    assert model.flags(model.index(0, 0)) & Qt.ItemIsEditable
+
+
+def test_table_model_passes_model_tester(qapp):
+    table = make_table()
+    model = RxTableModel(table, editable=True, coalesce=False)
+    QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+    table.append_rows([['c', 3.0]])
+    table[0, 1] = 4.0
+    table.remove_rows(0)
+    assert model.rowCount() == 2
+
+
+def test_list_model_extend_from_generator(qapp):
+    state = RxList(['a'])
+    model = RxListModel(state)
+    state.extend(x for x in 'bcd')
+    assert model.rowCount() == 4
+    assert model.row_of('c') == 2
+    assert model.data(model.index(3, 0)) == 'd'
@@ -0,0 +1,78 @@
+"""
+ReaQt example: Reactive Vertical Box with pooled item widgets
+"""
+import random
+
+from qtpy.QtCore import QTimer # pylint: disable=E0611
+from qtpy.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout # pylint: disable=E0611
+
+from reaqt.widgets import RxVBox, RxPushButton
+from reaqt.state import RxList
+
+class Order(QLabel):
+    """Item widget that can be rebound to another item instead of being rebuilt"""
+
+    def __init__(self, index, order):
+        super().__init__()
+        self.rebind(index, order)
+
+    def rebind(self, index, order):
+        price, quantity = order
+        self.setText("#{}: {} @ {:.2f}".format(index, quantity, price))
+
+    def reset(self):
+        self.clear()
+
+class MyWidget(QWidget):
+    """ReaQt example: Reactive Vertical Box with pooled item widgets"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.state = RxList([self.random_order() for _ in range(20)])
+
+        # Orders come and go all the time; the widgets of the removed
+        # orders are kept in a pool and reused for the new ones.
+        self.box = RxVBox(self.state, Order, pool_size=20)
+        stats = QLabel()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(50)
+        self.timer.timeout.connect(self.tick)
+        self.timer.timeout.connect(lambda: stats.setText(str(self.box.rx.pool.stats())))
+
+        streamButton = RxPushButton("Start or stop the updates")
+        streamButton.rx.clicked.subscribe(
+            lambda _: self.timer.stop() if self.timer.isActive() else self.timer.start())
+
+        layout = QVBoxLayout()
+        layout.addWidget(stats)
+        layout.addWidget(self.box)
+        layout.addStretch(1)
+        layout.addWidget(streamButton)
+        self.setLayout(layout)
+
+    @staticmethod
+    def random_order():
+        return (round(random.uniform(99, 101), 2), random.randint(1, 100))
+
+    def tick(self):
+        with self.state.batch():
+            for _ in range(3):
+                self.state.pop(random.randrange(len(self.state)))
+                self.state.append(self.random_order())
+            self.state.sort(reverse=True)
+
+
+def test_main():
+    """Run the example"""
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
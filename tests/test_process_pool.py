@@ -0,0 +1,61 @@
+"""
+ReaQt example: a slow derived value computed in a worker process
+"""
+from qtpy.QtWidgets import QApplication
+from qtpy.QtCore import Qt
+from rx import Observable
+
+from reaqt.widgets import RxWidget, RxLabel, RxSlider
+from reaqt.scheduling import map_in_process
+from reaqt.state import RxMap
+from reaqt.utils.layout import vbox
+
+def count_primes(limit):
+    """Count the primes below limit, slowly, in pure Python"""
+    return sum(1 for n in range(2, limit) if all(n % d for d in range(2, int(n ** 0.5) + 1)))
+
+def primes_between(bounds):
+    low, high = bounds
+    return count_primes(high) - count_primes(low)
+
+class PrimesWidget(RxWidget):
+    """The count is computed out of the GUI thread, so the sliders never freeze;
+    while they are dragged, only the latest bounds are counted."""
+
+    def __init__(self, parent=None):
+        super(PrimesWidget, self).__init__(parent)
+
+        s_low = RxSlider(Qt.Horizontal, minimum=0, maximum=200000)
+        s_high = RxSlider(Qt.Horizontal, minimum=0, maximum=200000)
+        l_low = RxLabel(lambda v: "From: {}".format(v))
+        l_high = RxLabel(lambda v: "To: {}".format(v))
+        l_count = RxLabel(lambda v: "Primes: {}".format(v))
+
+        self.setLayout(vbox(l_low, s_low, l_high, s_high, l_count))
+
+        self.state = RxMap({"low": 0, "high": 100000})
+
+        self.state["low"].subscribe(s_low.rx.value)
+        self.state["high"].subscribe(s_high.rx.value)
+        s_low.rx.value.subscribe(self.state["low"])
+        s_high.rx.value.subscribe(self.state["high"])
+        self.state["low"].subscribe(l_low.rx.text)
+        self.state["high"].subscribe(l_high.rx.text)
+
+        map_in_process(Observable.combine_latest(self.state["low"], self.state["high"],
+                                                lambda *bounds: bounds),
+                       primes_between) \
+            .subscribe(l_count.rx.text)
+
+
+def test_main():
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = PrimesWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
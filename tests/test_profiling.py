@@ -0,0 +1,43 @@
+import json
+
+from reaqt import profiling
+from reaqt.common import RxObservable, RxObserver
+from reaqt.widgets import RxSpinBox
+
+
+def test_counts_updates_and_emissions(qapp, tmp_path):
+    profiling.reset()
+    spin = RxSpinBox()
+    spin.setObjectName('spin')
+    spin.rx.value.subscribe(lambda value: None)
+    with profiling.profiled():
+        assert profiling.is_enabled()
+        for value in range(3):
+            spin.rx.value.on_next(value)
+        spin.setValue(10)
+        spin.setValue(11)
+    assert not profiling.is_enabled()
+
+    stats = profiling.report()['RxSpinBox#spin.value']
+    assert stats['updates'] == 3
+    assert stats['emissions'] == 2
+    assert sum(stats['update_latency']['buckets'].values()) == 3
+    assert sum(stats['emission_latency']['buckets'].values()) == 2
+    assert profiling.report_by_widget()['RxSpinBox#spin']['updates'] == 3
+
+    path = tmp_path / 'profile.json'
+    profiling.dump(str(path))
+    assert json.loads(path.read_text())['ports']['RxSpinBox#spin.value']['emissions'] == 2
+
+
+def test_disabled_profiling_costs_nothing(qapp):
+    profiling.reset()
+    apply, emit = RxObserver.apply, RxObservable.emit
+    with profiling.profiled():
+        assert RxObserver.apply is not apply
+    # The original methods are restored, and nothing is recorded
+    assert RxObserver.apply is apply
+    assert RxObservable.emit is emit
+    spin = RxSpinBox()
+    spin.rx.value.on_next(3)
+    assert profiling.report() == {}
@@ -0,0 +1,43 @@
+import threading
+import time
+
+from rx import Observable
+
+from reaqt.scheduling import (QtMainThreadScheduler, main_thread_scheduler, observe_on_main_thread,
+                              observe_on_thread_pool)
+
+
+def process_events(qapp, seconds, until=lambda: False):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end and not until():
+        qapp.processEvents()
+        time.sleep(0.001)
+
+
+def test_values_from_worker_threads_arrive_on_the_main_thread(qapp):
+    main = threading.get_ident()
+    workers = []
+    received = []
+
+    def work(x):
+        workers.append(threading.get_ident())
+        return x * 2
+
+    observe_on_main_thread(observe_on_thread_pool(Observable.from_([1, 2, 3])).map(work)) \
+        .subscribe(lambda x: received.append((x, threading.get_ident())))
+    process_events(qapp, 2, lambda: len(received) == 3)
+    assert received == [(2, main), (4, main), (6, main)]
+    assert main not in workers
+
+
+def test_scheduled_actions_run_from_the_event_loop(qapp):
+    scheduler = main_thread_scheduler()
+    assert isinstance(scheduler, QtMainThreadScheduler)
+    ran = []
+    scheduler.schedule(lambda sc, state: ran.append(state), 'now')
+    cancelled = scheduler.schedule(lambda sc, state: ran.append(state), 'cancelled')
+    cancelled.dispose()
+    scheduler.schedule_relative(20, lambda sc, state: ran.append(state), 'later')
+    assert ran == []
+    process_events(qapp, 2, lambda: 'later' in ran)
+    assert ran == ['now', 'later']
@@ -0,0 +1,61 @@
+"""
+ReaQt example: Reactive Vertical Box rendered in slices
+"""
+from qtpy.QtWidgets import QApplication, QWidget, QProgressBar, QScrollArea, QVBoxLayout # pylint: disable=E0611
+
+from reaqt.widgets import RxVBox, RxLabel, RxPushButton
+from reaqt.state import RxList
+
+class Row(RxLabel):
+    """Item whose index is updated in place when it moves"""
+
+    def __init__(self, index, item):
+        super().__init__(insert=lambda i: "#{}: {}".format(i, item))
+        self.rx.index = self.rx.text
+        self.rx.index.on_next(index)
+
+class MyWidget(QWidget):
+    """ReaQt example: Reactive Vertical Box rendered in slices"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.state = RxList(["row {}".format(i) for i in range(20000)])
+
+        # The rows are built 10 ms at a time, so the window
+        # can be moved and the buttons clicked while they appear
+        box = RxVBox(self.state, Row, frame_budget=10)
+        progress = QProgressBar()
+        box.rx.progress.subscribe(lambda p: (progress.setMaximum(p[1]), progress.setValue(p[0])))
+
+        scroll = QScrollArea()
+        scroll.setWidget(box)
+        scroll.setWidgetResizable(True)
+
+        extendButton = RxPushButton("Add 20000 rows")
+        extendButton.rx.clicked.subscribe(
+            lambda _: self.state.extend(["more {}".format(i) for i in range(20000)]))
+        # Changes made while rendering are applied in order
+        insertButton = RxPushButton("Insert a row at the start")
+        insertButton.rx.clicked.subscribe(lambda _: self.state.insert(0, "first"))
+
+        layout = QVBoxLayout()
+        layout.addWidget(progress)
+        layout.addWidget(extendButton)
+        layout.addWidget(insertButton)
+        layout.addWidget(scroll)
+        self.setLayout(layout)
+
+
+def test_main():
+    """Run the example"""
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
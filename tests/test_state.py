@@ -0,0 +1,160 @@
+import random
+
+import pytest
+
+from reaqt.state import (FrozenDict, FrozenList, RxList, RxListChange, RxListEvent, RxMap, RxTable,
+                         RxTableEvent, changed_paths)
+
+
+def record(subject):
+    values = []
+    subject.subscribe(values.append)
+    return values
+
+
+def test_list_batch_emits_one_compacted_event():
+    state = RxList([])
+    events = record(state._stream)
+    lengths = record(state.length)
+    with state.batch():
+        state.append(1)
+        state.extend([2, 3])
+        state.append(4)
+    assert events == [(RxListEvent.extend, [1, 2, 3, 4])]
+    assert lengths == [4]
+
+
+def test_list_batch_drops_the_events_before_a_clear():
+    state = RxList([1, 2])
+    events = record(state._stream)
+    with state.batch():
+        state.append(3)
+        state.clear()
+        state.append(4)
+        state.sort()
+        state.reverse()
+    assert events == [(RxListEvent.batch, [(RxListEvent.clear, None),
+                                           (RxListEvent.extend, [4]),
+                                           (RxListEvent.reverse, [4])])]
+    assert list(state) == [4]
+
+
+def test_nested_batches_emit_once():
+    state = RxList([])
+    events = record(state._stream)
+    with state.batch():
+        with state.batch():
+            state.append(1)
+        assert events == []
+        state.append(2)
+    assert events == [(RxListEvent.extend, [1, 2])]
+
+
+def test_map_batch_emits_the_last_value_of_each_key():
+    state = RxMap({'a': 0, 'b': 0, 'items': RxList([])})
+    a = record(state['a'])
+    items = record(state['items']._stream)
+    with state.batch():
+        state['a'] = 1
+        state['a'] = 2
+        state['items'].append('x')
+        state['items'].append('y')
+        assert a == [0]
+    assert a == [0, 2]
+    assert items == [(RxListEvent.extend, ['x', 'y'])]
+
+
+def test_splice_emits_a_change():
+    state = RxList(list('abcde'))
+    events = record(state._stream)
+    state.splice(1, 3, 'XYZ')
+    assert list(state) == list('aXYZde')
+    assert events == [(RxListEvent.splice, RxListChange(1, 2, ['X', 'Y', 'Z']))]
+    assert events[0][1].delta == 1
+
+
+def test_item_and_slice_assignment_match_plain_lists():
+    rng = random.Random(0)
+    plain = list(range(20))
+    state = RxList(list(plain))
+    # Replaying the events on a copy gives the same list
+    mirror = list(plain)
+
+    def replay(event):
+        typ, value = event
+        if typ == RxListEvent.batch:
+            for sub_event in value:
+                replay(sub_event)
+        elif typ == RxListEvent.splice:
+            value.apply(mirror)
+        elif typ == RxListEvent.delitem:
+            del mirror[value]
+
+    state._stream.subscribe(replay)
+    for _ in range(200):
+        n = len(plain)
+        i, j = sorted(rng.randrange(-n - 2, n + 3) for _ in range(2))
+        step = rng.choice([None, 1, 2, -1, -2])
+        key = slice(i, j, step)
+        operation = rng.randrange(3)
+        if operation == 0 and n:
+            index = rng.randrange(-n, n)
+            plain[index] = state[index] = rng.random()
+        elif operation == 1:
+            del plain[key]
+            del state[key]
+        elif step in (None, 1):
+            values = [rng.random() for _ in range(rng.randrange(4))]
+            plain[key] = state[key] = values
+        else:
+            values = [rng.random() for _ in range(len(plain[key]))]
+            plain[key] = state[key] = values
+        assert list(state) == plain
+        assert mirror == plain
+
+
+def test_table_remove_rows_with_a_negative_index():
+    table = RxTable(['name'], [[name] for name in 'abcde'])
+    events = record(table._stream)
+    table.remove_rows(-1)
+    assert events == [(RxTableEvent.remove, (4, 1))]
+    table.remove_rows(-3, 2)
+    assert events[-1] == (RxTableEvent.remove, (1, 2))
+    assert table.freeze() == [['a'], ['d']]
+    table.remove_rows(-3)
+    assert table.freeze() == [['d']]
+
+
+def test_freeze_is_cached_until_a_change():
+    state = RxMap({'name': 'a', 'items': RxList([1])})
+    first = state.freeze()
+    assert isinstance(first, FrozenDict)
+    assert isinstance(first['items'], FrozenList)
+    assert state.freeze() is first
+    version = state.version
+    state['name'] = 'b'
+    second = state.freeze()
+    assert second is not first
+    assert state.version > version
+    assert second.version == state.version
+
+
+def test_freeze_shares_unchanged_subtrees():
+    state = RxMap({'left': RxMap({'items': RxList([1, 2])}),
+                   'right': RxMap({'items': RxList([3])})})
+    before = state.freeze()
+    state['right']['items'].append(4)
+    after = state.freeze()
+    assert after['left'] is before['left']
+    assert after['right'] is not before['right']
+    assert after['right']['items'] == [3, 4]
+    assert before['right']['items'] == [3]
+    assert list(changed_paths(before, after)) == [('right', 'items')]
+
+
+def test_frozen_snapshots_are_immutable():
+    frozen = RxMap({'items': RxList([1])}).freeze()
+    with pytest.raises(TypeError):
+        frozen['items'].append(2)
+    with pytest.raises(TypeError):
+        frozen['other'] = 1
@@ -0,0 +1,72 @@
+"""
+ReaQt example: Reactive Table Model
+"""
+import random
+
+from qtpy.QtCore import QTimer # pylint: disable=E0611
+from qtpy.QtWidgets import QApplication, QWidget, QLabel, QTableView, QVBoxLayout # pylint: disable=E0611
+
+from reaqt.widgets import RxPushButton
+from reaqt.models import RxTableModel
+from reaqt.state import RxTable
+
+ROWS = 100000
+COLUMNS = 20
+
+class MyWidget(QWidget):
+    """ReaQt example: Reactive Table Model"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.state = RxTable([('sensor', str)] + [('c{}'.format(i), float) for i in range(COLUMNS - 1)],
+                             [['S{}'.format(row)] + [0.0] * (COLUMNS - 1) for row in range(ROWS)])
+
+        streamButton = RxPushButton("Start or stop streaming updates")
+        insert0Button = RxPushButton("self.state.insert_rows(0, ...)")
+        removeButton = RxPushButton("self.state.remove_rows(0)")
+
+        # Hundreds of cells change on every tick, but the view
+        # only receives a few dataChanged rectangles.
+        self.timer = QTimer(self)
+        self.timer.setInterval(10)
+        self.timer.timeout.connect(self.tick)
+
+        streamButton.rx.clicked.subscribe(
+            lambda _: self.timer.stop() if self.timer.isActive() else self.timer.start())
+        insert0Button.rx.clicked.subscribe(
+            lambda _: self.state.insert_rows(0, [['New'] + [1.0] * (COLUMNS - 1)]))
+        removeButton.rx.clicked.subscribe(lambda _: self.state.remove_rows(0))
+
+        view = QTableView()
+        view.setModel(RxTableModel(self.state, editable=True,
+                                   formats={i: "{:.3f}".format for i in range(1, COLUMNS)}))
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("This table is shown by a QTableView."))
+        layout.addWidget(view)
+        layout.addWidget(streamButton)
+        layout.addWidget(insert0Button)
+        layout.addWidget(removeButton)
+
+        self.setLayout(layout)
+
+    def tick(self):
+        with self.state.batch():
+            for _ in range(500):
+                self.state[random.randrange(50), random.randrange(1, COLUMNS)] = random.random()
+            self.state.set_column(1, [random.random()] * ROWS)
+
+
+def test_main():
+    """Run the example"""
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
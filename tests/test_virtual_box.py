@@ -0,0 +1,59 @@
+"""
+ReaQt example: Reactive Virtualized Box
+"""
+
+from qtpy.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout # pylint: disable=E0611
+
+from reaqt.widgets import RxVirtualBox, RxLabel, RxPushButton
+from reaqt.state import RxList
+
+class MyWidget(QWidget):
+    """ReaQt example: Reactive Virtualized Box"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        class Item(RxLabel):
+            """Item that can be recycled for another row"""
+
+            def __init__(self, index, value):
+                super().__init__()
+                self.rebind(index, value)
+
+            def rebind(self, index, value):
+                self.rx.text.on_next("Item #{} is '{}'.".format(index, value))
+
+        # Only the visible items will ever be turned into widgets.
+        self.state = RxList(list(range(100000)))
+
+        insert0Button = RxPushButton("self.state.insert(0, -1)")
+        popButton = RxPushButton("self.state.pop(0)")
+        reverseButton = RxPushButton("self.state.reverse()")
+
+        insert0Button.rx.clicked.subscribe(lambda _: self.state.insert(0, -1))
+        popButton.rx.clicked.subscribe(lambda _: len(self.state) and self.state.pop(0))
+        reverseButton.rx.clicked.subscribe(lambda _: self.state.reverse())
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("This list contains 100000 items."))
+        layout.addWidget(RxVirtualBox(self.state, Item))
+        layout.addWidget(insert0Button)
+        layout.addWidget(popButton)
+        layout.addWidget(reverseButton)
+
+        self.setLayout(layout)
+
+
+
+def test_main():
+    """Run the example"""
+    import sys
+
+    app = QApplication(sys.argv)
+    app.setStyle("Fusion")
+    widget = MyWidget()
+    widget.show()
+    sys.exit(app.exec_())
+
+if __name__ == "__main__":
+    test_main()
@@ -0,0 +1,178 @@
+from qtpy.QtWidgets import QLabel
+from rx.subjects import Subject
+
+from reaqt.common import RxPortManager
+from reaqt.state import RxList
+from reaqt.widgets import RxCase, RxComboBox, RxIf, RxSimpleComboBox, RxVBox, RxVirtualBox
+
+
+class Item(QLabel):
+    def __init__(self, index, item):
+        super().__init__(str(item))
+        self.index = index
+        self.item = item
+
+
+class IndexedItem(Item):
+    def __init__(self, index, item):
+        super().__init__(index, item)
+        self.rx = RxPortManager()
+        self.rx.index = Subject()
+        self.rx.index.subscribe(lambda index: setattr(self, 'index', index))
+
+
+def box_widgets(box):
+    layout = box.layout()
+    return [layout.itemAt(i).widget() for i in range(layout.count())]
+
+
+def box_items(box):
+    return [widget.item for widget in box_widgets(box)]
+
+
+def assert_indexed(box):
+    assert [widget.index for widget in box_widgets(box)] == list(range(box.layout().count()))
+
+
+def test_box_extend_from_generator(qapp):
+    state = RxList([])
+    box = RxVBox(state, Item)
+    state.extend(x for x in 'abc')
+    assert box_items(box) == ['a', 'b', 'c']
+    state.pop()
+    assert box_items(box) == ['a', 'b']
+    assert box.rx.controller.items == ['a', 'b']
+
+
+def test_box_reindexes_after_insert_and_pop(qapp):
+    for item_class in (Item, IndexedItem):
+        state = RxList(list('abcd'))
+        box = RxVBox(state, item_class)
+        last = box_widgets(box)[-1]
+        state.insert(0, 'z')
+        assert box_items(box) == list('zabcd')
+        assert_indexed(box)
+        state.pop(0)
+        state.insert(2, 'y')
+        state.pop(1)
+        assert box_items(box) == list('aycd')
+        assert_indexed(box)
+        # Widgets with an index port are kept
+        assert (box_widgets(box)[-1] is last) == (item_class is IndexedItem)
+
+
+def test_keyed_box_reuses_widgets_on_sort(qapp):
+    state = RxList(list('dbca'))
+    box = RxVBox(state, IndexedItem, key=lambda item: item)
+    widgets = {widget.item: widget for widget in box_widgets(box)}
+    state.sort()
+    assert box_items(box) == list('abcd')
+    assert_indexed(box)
+    state.reverse()
+    assert box_items(box) == list('dcba')
+    assert_indexed(box)
+    assert all(widget is widgets[widget.item] for widget in box_widgets(box))
+
+
+def test_keyed_box_without_index_port_rebuilds_on_sort(qapp):
+    state = RxList(list('dbca'))
+    box = RxVBox(state, Item, key=lambda item: item)
+    state.sort()
+    assert box_items(box) == list('abcd')
+    assert_indexed(box)
+    state.reverse()
+    assert box_items(box) == list('dcba')
+    assert_indexed(box)
+
+
+def test_virtual_box_extend_from_generator(qapp):
+    state = RxList(['a'])
+    box = RxVirtualBox(state, Item, item_height=20)
+    box.resize(200, 200)
+    box.show()
+    qapp.processEvents()
+    state.extend(x for x in 'bcd')
+    qapp.processEvents()
+    controller = box.rx.controller
+    assert controller.length == 4
+    assert sorted((row, widget.item) for row, widget in controller.rows.items()) == \
+        [(0, 'a'), (1, 'b'), (2, 'c'), (3, 'd')]
+
+
+def test_combo_box_set_items_keeps_the_selection(qapp):
+    combo = RxComboBox(RxList(list('abcde')))
+    values = []
+    combo.rx.value.subscribe(values.append)
+    combo.rx.value.on_next('c')
+    values.clear()
+    # 'c' is in the spliced rows, and moves
+    combo.rx.items.on_next(list('cbade'))
+    assert combo.value() == 'c'
+    combo.rx.items.on_next(list('xxxcxxe'))
+    assert combo.value() == 'c'
+    assert combo.currentIndex() == 3
+    assert values == []
+    # Once it's gone, the new value is emitted once
+    combo.rx.items.on_next(list('xxe'))
+    assert len(values) == 1
+    assert values[0] == combo.value()
+    combo.rx.items.on_next([])
+    assert values[1:] == [None]
+
+
+def test_simple_combo_box_ports_are_lazy(qapp):
+    combo = RxSimpleComboBox()
+    assert not combo.rx.is_created('items')
+    assert not combo.rx.is_created('value')
+    combo.set_options_and_value(['a', 'b', 'c'], 'b')
+    assert not combo.rx.is_created('value')
+    assert combo.currentText() == 'b'
+
+    values = []
+    combo.rx.value.subscribe(values.append)
+    assert combo.rx.is_created('value')
+    combo.rx.items.on_next(['x', 'y', 'z'])
+    combo.rx.value.on_next('y')
+    assert combo.currentText() == 'y'
+    combo.setCurrentIndex(2)
+    assert values[-1] == 'z'
+
+
+def counting_builder(name, built):
+    def build():
+        built.append(name)
+        return QLabel(name)
+    return build
+
+
+def shown_text(widget):
+    return widget.layout().itemAt(0).widget().text()
+
+
+def test_if_doesnt_rebuild_the_displayed_branch(qapp):
+    condition = Subject()
+    built = []
+    widget = RxIf(condition, counting_builder('then', built), counting_builder('else', built))
+    condition.on_next(True)
+    condition.on_next(1)
+    assert built == ['then']
+    condition.on_next(False)
+    condition.on_next(True)
+    assert built == ['then', 'else', 'then']
+    assert shown_text(widget) == 'then'
+    assert widget.layout().count() == 1
+
+
+def test_keep_alive_reuses_cached_branches(qapp):
+    value = Subject()
+    built = []
+    widget = RxCase(value, [(name, counting_builder(name, built)) for name in 'abc'], keep_alive=1)
+    for name in 'abab':
+        value.on_next(name)
+        assert shown_text(widget) == name
+    assert built == ['a', 'b']
+    # Only one branch is kept besides the displayed one
+    value.on_next('c')
+    value.on_next('a')
+    assert built == ['a', 'b', 'c', 'a']
+    assert list(widget.rx.cache) == [2]